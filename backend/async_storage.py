@@ -0,0 +1,184 @@
+"""Async facade over storage that keeps blocking I/O off the event loop."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Tuple, Callable, AsyncIterator
+
+from . import storage
+from .config import STORAGE_THREADS
+
+# Ordering key for settings, which are not tied to a conversation
+SETTINGS_KEY = "__settings__"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_stats = {
+    "operations": 0,
+    "in_flight": 0,
+    "queued": 0,
+    "total_wait_ms": 0.0,
+    "total_run_ms": 0.0,
+}
+
+
+class KeyedLocks:
+    """
+    One asyncio.Lock per key, dropped again once nobody holds or waits on it.
+
+    asyncio.Lock wakes waiters in FIFO order, so operations on the same key
+    run one at a time in the order they were issued.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Hold the lock for `key` for the duration of the block."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[key] -= 1
+            if self._users[key] == 0:
+                del self._users[key]
+                del self._locks[key]
+
+
+_locks = KeyedLocks()
+
+
+def start() -> None:
+    """Create the storage thread pool. Called once at app startup."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=STORAGE_THREADS, thread_name_prefix="storage")
+
+
+def shutdown() -> None:
+    """Wait for queued writes, then close the pool and the storage backend."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    storage.close_backend()
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Get storage pool metrics.
+
+    Returns:
+        Dict with operation counts, current queue depth and average wait/run times
+    """
+    operations = _stats["operations"]
+    return {
+        "operations": operations,
+        "in_flight": _stats["in_flight"],
+        "queued": _stats["queued"],
+        "locked_conversations": len(_locks),
+        "avg_wait_ms": round(_stats["total_wait_ms"] / operations, 2) if operations else 0.0,
+        "avg_run_ms": round(_stats["total_run_ms"] / operations, 2) if operations else 0.0,
+    }
+
+
+async def _run(key: Optional[str], func: Callable, *args) -> Any:
+    """
+    Run a blocking storage call in the pool.
+
+    Calls sharing a key run one at a time, in the order they were made.
+    """
+    if _executor is None:
+        start()
+
+    loop = asyncio.get_running_loop()
+    queued_at = time.perf_counter()
+    _stats["queued"] += 1
+
+    async def call():
+        started_at = time.perf_counter()
+        _stats["queued"] -= 1
+        _stats["in_flight"] += 1
+        future = loop.run_in_executor(_executor, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted, so keep holding the key until
+            # it finishes; otherwise the next call could overtake this one
+            await asyncio.wait({future})
+            raise
+        finally:
+            finished_at = time.perf_counter()
+            _stats["in_flight"] -= 1
+            _stats["operations"] += 1
+            _stats["total_wait_ms"] += (started_at - queued_at) * 1000
+            _stats["total_run_ms"] += (finished_at - started_at) * 1000
+
+    if key is None:
+        return await call()
+    async with _locks.hold(key):
+        return await call()
+
+
+async def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """Async version of storage.create_conversation."""
+    return await _run(conversation_id, storage.create_conversation, conversation_id)
+
+
+async def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """Async version of storage.get_conversation."""
+    return await _run(conversation_id, storage.get_conversation, conversation_id)
+
+
+async def list_conversations_page(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Async version of storage.list_conversations_page."""
+    return await _run(None, storage.list_conversations_page, limit, cursor)
+
+
+async def add_user_message(conversation_id: str, content: str) -> None:
+    """Async version of storage.add_user_message."""
+    await _run(conversation_id, storage.add_user_message, conversation_id, content)
+
+
+async def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any]
+) -> None:
+    """Async version of storage.add_assistant_message."""
+    await _run(conversation_id, storage.add_assistant_message, conversation_id, stage1, stage2, stage3)
+
+
+async def update_conversation_title(conversation_id: str, title: str) -> None:
+    """Async version of storage.update_conversation_title."""
+    await _run(conversation_id, storage.update_conversation_title, conversation_id, title)
+
+
+async def update_conversation_summary(conversation_id: str, summary: Dict[str, Any]) -> None:
+    """Async version of storage.update_conversation_summary."""
+    await _run(conversation_id, storage.update_conversation_summary, conversation_id, summary)
+
+
+async def get_settings() -> Dict[str, Any]:
+    """Async version of storage.get_settings."""
+    return await _run(SETTINGS_KEY, storage.get_settings)
+
+
+async def save_settings(settings: Dict[str, Any]) -> None:
+    """Async version of storage.save_settings."""
+    await _run(SETTINGS_KEY, storage.save_settings, settings)
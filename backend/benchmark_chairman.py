@@ -0,0 +1,133 @@
+"""
+Compare the full and compact chairman contexts on live council runs.
+
+For each question, Stage 1 and Stage 2 run once; the chairman is then asked
+with both prompts, alternating which goes first, with the response cache
+bypassed. Reports prompt tokens (estimated, and as billed when the model
+reports usage), time to first token and total chairman time.
+
+Usage:
+    uv run python -m backend.benchmark_chairman [--repeats N] [--chairman MODEL] [question ...]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List
+
+from .concurrency import PRIORITY_HIGH
+from .config import DEFAULT_COUNCIL_MODELS, DEFAULT_CHAIRMAN_MODEL, STAGE3_PROMPT_MAX_TOKENS
+from .copilot_client import is_ready, query_model, start_client, stop_client
+from .council import (
+    _build_chairman_prompt,
+    calculate_aggregate_rankings,
+    stage1_collect_responses,
+    stage2_collect_rankings,
+)
+from .prompt_budget import prompt_budget
+from .tokens import estimate_tokens
+
+MODES = ("full", "compact")
+
+DEFAULT_QUESTIONS = [
+    "What are the trade-offs between optimistic and pessimistic locking in a relational database?",
+    "Explain why the sky is blue to a curious ten-year-old, then to a physics undergraduate.",
+    "How should a small team decide between a monorepo and multiple repositories?",
+]
+
+# Seconds to wait for the Copilot client to come up
+STARTUP_TIMEOUT = 60.0
+
+
+async def _time_chairman(chairman: str, prompt: str) -> Dict[str, Any]:
+    """Ask the chairman once, uncached, and time the first token and the whole answer."""
+    started = time.monotonic()
+    first_token: List[float] = []
+
+    def on_delta(delta: str) -> None:
+        if not first_token:
+            first_token.append(time.monotonic() - started)
+
+    response = await query_model(
+        chairman,
+        [{"role": "user", "content": prompt}],
+        on_delta,
+        use_cache=False,
+        priority=PRIORITY_HIGH
+    )
+    return {
+        "error": response.get('error'),
+        "ttft": first_token[0] if first_token else None,
+        "total": time.monotonic() - started,
+        "input_tokens": (response.get('usage') or {}).get('input_tokens'),
+    }
+
+
+async def benchmark(questions: List[str], council_models: List[str], chairman: str, repeats: int) -> None:
+    """Run the comparison and print one summary line per mode."""
+    results: Dict[str, List[Dict[str, Any]]] = {mode: [] for mode in MODES}
+    budget = prompt_budget([chairman], STAGE3_PROMPT_MAX_TOKENS)
+
+    for number, question in enumerate(questions, start=1):
+        print(f"[{number}/{len(questions)}] {question}")
+        stage1_results = await stage1_collect_responses(question, council_models)
+        stage2_results, label_to_model = await stage2_collect_rankings(question, stage1_results, council_models)
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+
+        prompts = {
+            mode: _build_chairman_prompt(
+                question, stage1_results, stage2_results, budget,
+                aggregate_rankings, label_to_model, mode
+            )[0]
+            for mode in MODES
+        }
+        for repeat in range(repeats):
+            # Alternate the order so neither mode always runs on a warmer model
+            order = MODES if repeat % 2 == 0 else tuple(reversed(MODES))
+            for mode in order:
+                run = await _time_chairman(chairman, prompts[mode])
+                run["estimated_tokens"] = estimate_tokens(prompts[mode])
+                results[mode].append(run)
+                status = f"error: {run['error']}" if run['error'] else f"{run['total']:.1f}s"
+                print(f"    {mode:<8} {run['estimated_tokens']:>7} tokens  {status}")
+
+    print()
+    print(f"{'mode':<8} {'est. tokens':>12} {'billed tokens':>14} {'ttft p50':>9} {'total p50':>10} {'errors':>7}")
+    for mode in MODES:
+        runs = results[mode]
+        ok = [run for run in runs if not run['error']]
+        billed = [run['input_tokens'] for run in ok if run['input_tokens'] is not None]
+        ttfts = [run['ttft'] for run in ok if run['ttft'] is not None]
+        print(
+            f"{mode:<8} "
+            f"{statistics.median(run['estimated_tokens'] for run in runs):>12.0f} "
+            f"{statistics.median(billed) if billed else float('nan'):>14.0f} "
+            f"{statistics.median(ttfts) if ttfts else float('nan'):>8.2f}s "
+            f"{statistics.median(run['total'] for run in ok) if ok else float('nan'):>9.2f}s "
+            f"{len(runs) - len(ok):>7}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("questions", nargs="*", help="Questions to ask (default: a built-in set)")
+    parser.add_argument("--repeats", type=int, default=3, help="Chairman calls per mode and question")
+    parser.add_argument("--chairman", default=DEFAULT_CHAIRMAN_MODEL, help="Chairman model")
+    parser.add_argument("--council", nargs="+", default=DEFAULT_COUNCIL_MODELS, help="Council models")
+    args = parser.parse_args()
+
+    await start_client()
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not is_ready():
+            if time.monotonic() > deadline:
+                raise SystemExit(f"Copilot client not ready after {STARTUP_TIMEOUT:.0f}s")
+            await asyncio.sleep(0.5)
+        await benchmark(args.questions or DEFAULT_QUESTIONS, args.council, args.chairman, args.repeats)
+    finally:
+        await stop_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
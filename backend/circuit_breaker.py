@@ -0,0 +1,140 @@
+"""Per-model circuit breakers so an unhealthy model fails fast."""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one model.
+
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the breaker. Open: calls are refused without touching the model until
+    `reset_timeout` seconds have passed. Half-open: up to `probes` calls are
+    let through as probes; a successful probe closes the breaker and a failed
+    one opens it again for another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, probes: int = 1):
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_probes = probes
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probes = 0
+        self._last_error: Optional[str] = None
+        self._stats = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout has passed."""
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            self._state = STATE_HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit for {self._name} is half-open; probing")
+        return self._state
+
+    def is_open(self) -> bool:
+        """Return True if calls would currently be refused."""
+        state = self.state
+        return state == STATE_OPEN or (state == STATE_HALF_OPEN and self._probes >= self._max_probes)
+
+    def allow(self) -> bool:
+        """
+        Ask to make a call. In the half-open state this claims a probe slot,
+        which must be given back with record() or release().
+
+        Returns:
+            True if the call may go ahead
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and self._probes < self._max_probes:
+            self._probes += 1
+            return True
+        self._stats["rejected"] += 1
+        return False
+
+    def record(self, ok: bool, error: Optional[str] = None) -> None:
+        """
+        Record the outcome of an allowed call.
+
+        Args:
+            ok: Whether the model responded healthily
+            error: Error message for a failed call
+        """
+        if self._state == STATE_HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+        if ok:
+            if self._state != STATE_CLOSED:
+                logger.info(f"Circuit for {self._name} closed")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            return
+
+        self._failures += 1
+        self._last_error = error
+        if self._state == STATE_HALF_OPEN or self._failures >= self._failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that ended without an outcome."""
+        if self._state == STATE_HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker starts letting probes through."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._reset_timeout - (time.monotonic() - self._opened_at))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for health reporting."""
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "retry_after": round(self.retry_after(), 1),
+            "last_error": self._last_error,
+            **self._stats,
+        }
+
+    def _open(self) -> None:
+        if self._state != STATE_OPEN:
+            self._stats["opened"] += 1
+            logger.warning(
+                f"Circuit for {self._name} opened after {self._failures} failures: {self._last_error}"
+            )
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per model, created on first use."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, probes: int = 1):
+        self._settings = (failure_threshold, reset_timeout, probes)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, model: str) -> CircuitBreaker:
+        """Return the breaker for `model`."""
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(model, *self._settings)
+        return breaker
+
+    def snapshot(self, model: str) -> Dict[str, Any]:
+        """Return the health snapshot for `model`."""
+        return self.get(model).snapshot()
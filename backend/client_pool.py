@@ -0,0 +1,306 @@
+"""Pool of Copilot clients, each with its own CLI process and session pool."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .session_pool import SessionPool
+
+logger = logging.getLogger(__name__)
+
+# Client states that mean the CLI process is gone and the client must be replaced
+DEAD_STATES = {"error", "disconnected"}
+
+
+class Shard:
+    """One Copilot client plus the warm sessions that belong to it."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.client: Any = None
+        self.sessions: Optional[SessionPool] = None
+        self.healthy = False
+        self.in_flight = 0
+        self.served = 0
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.last_healthy_ping: Optional[float] = None
+        self.ping_failures = 0
+        self.restart_backoff = 0.0
+        self.next_restart_at = 0.0
+
+
+class ClientPool:
+    """
+    Spreads model calls over `size` Copilot clients.
+
+    Every client drives its own CLI subprocess, so throughput is no longer
+    capped by a single process. Each call goes to the healthy client with
+    the fewest calls in flight.
+
+    A watchdog pings every client each `health_interval` seconds. A client
+    whose process has died, or that misses `ping_failures` pings in a row,
+    is taken out of rotation and replaced along with its session pool.
+    Failed restarts are retried with exponential backoff up to
+    `max_restart_backoff` seconds. While no client is healthy, calls wait in
+    acquire() and are released as soon as one comes back.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int,
+        session_pool_size: int,
+        session_idle_timeout: float,
+        health_interval: float,
+        ping_timeout: float,
+        ping_failures: int,
+        max_restart_backoff: float
+    ):
+        self._factory = factory
+        self._session_pool_size = session_pool_size
+        self._session_idle_timeout = session_idle_timeout
+        self._health_interval = health_interval
+        self._ping_timeout = ping_timeout
+        self._ping_failures = ping_failures
+        self._max_restart_backoff = max_restart_backoff
+        self._available = asyncio.Event()
+        self._waiting = 0
+        self._shards = [Shard(i) for i in range(max(1, size))]
+        self._restarting: Set[int] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        """Start every client and the health-check loop."""
+        results = await asyncio.gather(
+            *(self._start_shard(shard) for shard in self._shards),
+            return_exceptions=True
+        )
+        for shard, result in zip(self._shards, results):
+            if isinstance(result, Exception):
+                shard.last_error = str(result)
+                logger.error(f"Failed to start Copilot client {shard.index}: {result}")
+        if not any(shard.healthy for shard in self._shards):
+            raise RuntimeError("No Copilot client could be started")
+        self._health_task = asyncio.create_task(self._watch())
+
+    async def close(self) -> None:
+        """Stop the health-check loop and every client."""
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(
+            *(self._stop_shard(shard) for shard in self._shards),
+            return_exceptions=True
+        )
+
+    @property
+    def client(self) -> Any:
+        """A healthy client for calls that are not tied to a session (e.g. list_models)."""
+        return self._pick().client
+
+    async def acquire(self) -> Shard:
+        """
+        Pick the least-loaded healthy client for a call, waiting for one to
+        be restarted if none is healthy. Callers bound the wait with their
+        own deadline.
+
+        Returns:
+            The shard to use; hand it back with release()
+        """
+        while not any(shard.healthy for shard in self._shards):
+            if self._closed:
+                raise RuntimeError("Copilot client pool is closed")
+            self._waiting += 1
+            try:
+                await self._available.wait()
+            finally:
+                self._waiting -= 1
+
+        shard = self._pick()
+        shard.in_flight += 1
+        shard.served += 1
+        return shard
+
+    def pin(self, shard: Shard) -> bool:
+        """
+        Start a call on a specific client, e.g. one holding a live session.
+
+        Returns:
+            False if that client is not healthy; otherwise hand it back with release()
+        """
+        if not shard.healthy:
+            return False
+        shard.in_flight += 1
+        shard.served += 1
+        return True
+
+    def release(self, shard: Shard) -> None:
+        """Finish a call started with acquire()."""
+        shard.in_flight -= 1
+
+    async def warm(self, models: List[str], streaming: bool = False) -> None:
+        """Pre-create sessions for the given models on every healthy client."""
+        await asyncio.gather(
+            *(shard.sessions.warm(models, streaming) for shard in self._shards if shard.healthy),
+            return_exceptions=True
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-client load, health and session pool metrics."""
+        now = time.monotonic()
+        return {
+            "size": len(self._shards),
+            "healthy": sum(1 for shard in self._shards if shard.healthy),
+            "waiting": self._waiting,
+            "clients": [
+                {
+                    "index": shard.index,
+                    "healthy": shard.healthy,
+                    "in_flight": shard.in_flight,
+                    "served": shard.served,
+                    "restarts": shard.restarts,
+                    "uptime": round(now - shard.started_at, 1) if shard.started_at else None,
+                    "seconds_since_healthy_ping": (
+                        round(now - shard.last_healthy_ping, 1) if shard.last_healthy_ping else None
+                    ),
+                    "ping_failures": shard.ping_failures,
+                    "last_error": shard.last_error,
+                    "session_pool": shard.sessions.stats() if shard.sessions else {},
+                }
+                for shard in self._shards
+            ],
+        }
+
+    async def restart(self, shard: Shard, reason: str) -> None:
+        """Replace a shard's client and session pool with fresh ones."""
+        if shard.index in self._restarting or self._closed:
+            return
+        self._restarting.add(shard.index)
+        logger.warning(f"Restarting Copilot client {shard.index}: {reason}")
+        shard.last_error = reason
+        try:
+            await self._stop_shard(shard)
+            await self._start_shard(shard)
+            shard.restarts += 1
+            shard.restart_backoff = 0.0
+            logger.info(f"Copilot client {shard.index} restarted")
+        except Exception as e:
+            shard.last_error = f"Restart failed: {e}"
+            shard.restart_backoff = min(self._max_restart_backoff, max(1.0, shard.restart_backoff * 2))
+            shard.next_restart_at = time.monotonic() + shard.restart_backoff
+            logger.error(
+                f"Failed to restart Copilot client {shard.index}, "
+                f"retrying in {shard.restart_backoff:.0f}s: {e}"
+            )
+        finally:
+            self._restarting.discard(shard.index)
+
+    def _pick(self) -> Shard:
+        healthy = [shard for shard in self._shards if shard.healthy]
+        if not healthy:
+            raise RuntimeError("No healthy Copilot client available")
+        return min(healthy, key=lambda shard: (shard.in_flight, shard.served))
+
+    async def _start_shard(self, shard: Shard) -> None:
+        client = self._factory()
+        try:
+            await client.start()
+        except BaseException:
+            # The CLI process may already be running; the shard does not hold
+            # the client yet, so close() would never stop it
+            try:
+                await client.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Copilot client {shard.index} after a failed start: {e}")
+            raise
+        sessions = SessionPool(client, self._session_pool_size, self._session_idle_timeout)
+        sessions.start()
+        shard.client = client
+        shard.sessions = sessions
+        shard.started_at = time.monotonic()
+        shard.last_healthy_ping = shard.started_at
+        shard.ping_failures = 0
+        self._set_healthy(shard, True)
+
+    async def _stop_shard(self, shard: Shard) -> None:
+        self._set_healthy(shard, False)
+        if shard.sessions is not None:
+            await shard.sessions.close()
+            shard.sessions = None
+        if shard.client is not None:
+            try:
+                await shard.client.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Copilot client {shard.index}: {e}")
+            shard.client = None
+
+    def _set_healthy(self, shard: Shard, healthy: bool) -> None:
+        shard.healthy = healthy
+        if any(s.healthy for s in self._shards):
+            self._available.set()
+        else:
+            self._available.clear()
+
+    async def _watch(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self._health_interval)
+            results = await asyncio.gather(
+                *(self._check(shard) for shard in self._shards),
+                return_exceptions=True
+            )
+            # A failed check must not take the watchdog down with it
+            for shard, result in zip(self._shards, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Health check of Copilot client {shard.index} failed: "
+                        f"{str(result) or type(result).__name__}"
+                    )
+
+    async def _check(self, shard: Shard) -> None:
+        """Ping one client and restart it if it is dead or unresponsive."""
+        if shard.index in self._restarting:
+            return
+        if shard.client is None:
+            # A previous restart failed; try again once its backoff has passed
+            if time.monotonic() >= shard.next_restart_at:
+                self._spawn(self.restart(shard, shard.last_error or "not running"))
+            return
+
+        try:
+            state = shard.client.get_state()
+        except Exception as e:
+            state = None
+            logger.warning(f"Could not read state of Copilot client {shard.index}: {str(e) or type(e).__name__}")
+        if state in DEAD_STATES:
+            self._spawn(self.restart(shard, f"client state is {state}"))
+            return
+
+        try:
+            await asyncio.wait_for(shard.client.ping("health"), timeout=self._ping_timeout)
+        except Exception as e:
+            shard.ping_failures += 1
+            logger.warning(
+                f"Copilot client {shard.index} missed ping {shard.ping_failures}/{self._ping_failures}: "
+                f"{str(e) or type(e).__name__}"
+            )
+            if shard.ping_failures >= self._ping_failures:
+                # Stop routing calls to it before the restart gets going
+                self._set_healthy(shard, False)
+                self._spawn(self.restart(shard, f"{shard.ping_failures} missed pings"))
+            return
+
+        shard.ping_failures = 0
+        shard.last_healthy_ping = time.monotonic()
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
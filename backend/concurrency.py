@@ -0,0 +1,210 @@
+"""Adaptive per-model concurrency limits for upstream model calls."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Priority classes - lower values are served first
+PRIORITY_HIGH = 0    # the user is watching the output (chairman synthesis)
+PRIORITY_NORMAL = 1  # council stages
+PRIORITY_LOW = 2     # background work (conversation titles)
+
+
+class QueueFull(Exception):
+    """Raised when a model's waiting queue is already at its maximum."""
+
+
+class Permit:
+    """
+    A granted slot. Tell it how the call went via record(); a call that is
+    cancelled before recording leaves the limit untouched.
+    """
+
+    __slots__ = ("granted_at", "ok", "recorded")
+
+    def __init__(self):
+        self.granted_at = time.monotonic()
+        self.ok = True
+        self.recorded = False
+
+    def record(self, ok: bool) -> None:
+        """Record whether the upstream call succeeded."""
+        self.ok = ok
+        self.recorded = True
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one model, tuned by additive-increase /
+    multiplicative-decrease.
+
+    Every successful call that finishes within `latency_target` seconds
+    raises the limit by 1/limit, so it grows by about one per round of
+    calls. An error or a slow call multiplies it by `backoff`. Only calls
+    granted after the last decrease can trigger another one, so a burst of
+    failures from a single overloaded window halves the limit once rather
+    than collapsing it to the minimum.
+
+    Callers over the limit wait in a priority queue: lower priority values
+    first, FIFO within a class.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        latency_target: float,
+        backoff: float,
+        max_queue: int
+    ):
+        self._name = name
+        self._limit = float(initial)
+        self._minimum = float(minimum)
+        self._maximum = float(maximum)
+        self._latency_target = latency_target
+        self._backoff = backoff
+        self._max_queue = max_queue
+        self._in_flight = 0
+        self._waiting = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+        self._stats = {
+            "granted": 0,
+            "rejected": 0,
+            "increases": 0,
+            "decreases": 0,
+            "max_queue_depth": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> Permit:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Priority class; lower values are served first
+            timeout: Seconds to wait before giving up (None = no limit)
+
+        Returns:
+            A Permit to hand back to release()
+
+        Raises:
+            QueueFull: If `max_queue` callers are already waiting
+            asyncio.TimeoutError: If no slot opened within `timeout`
+        """
+        queued_at = time.monotonic()
+
+        if self._waiting == 0 and self._in_flight < self._capacity():
+            self._in_flight += 1
+            return self._grant(queued_at)
+
+        if self._waiting >= self._max_queue:
+            self._stats["rejected"] += 1
+            raise QueueFull(f"{self._waiting} requests already waiting")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self._waiting += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._waiting)
+        self._dispatch()
+
+        try:
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+            if not done:
+                future.cancel()
+                raise asyncio.TimeoutError()
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled - hand the slot on
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._waiting -= 1
+
+        return self._grant(queued_at)
+
+    def release(self, permit: Permit) -> None:
+        """Return a slot and adjust the limit from the call's outcome."""
+        self._in_flight -= 1
+
+        if permit.recorded:
+            slow = time.monotonic() - permit.granted_at > self._latency_target
+            if permit.ok and not slow:
+                self._increase()
+            elif permit.granted_at >= self._last_decrease:
+                self._decrease()
+
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit, load and queue metrics."""
+        granted = self._stats["granted"]
+        return {
+            "limit": round(self._limit, 2),
+            "in_flight": self._in_flight,
+            "queued": self._waiting,
+            **{k: v for k, v in self._stats.items() if k not in ("total_wait_ms", "max_wait_ms")},
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / granted, 2) if granted else 0.0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 2),
+        }
+
+    def _capacity(self) -> int:
+        return max(1, int(self._limit))
+
+    def _grant(self, queued_at: float) -> Permit:
+        wait_ms = (time.monotonic() - queued_at) * 1000
+        self._stats["granted"] += 1
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+        return Permit()
+
+    def _dispatch(self) -> None:
+        while self._queue and self._in_flight < self._capacity():
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _increase(self) -> None:
+        if self._limit < self._maximum:
+            self._limit = min(self._maximum, self._limit + 1 / self._limit)
+            self._stats["increases"] += 1
+
+    def _decrease(self) -> None:
+        self._last_decrease = time.monotonic()
+        if self._limit > self._minimum:
+            self._limit = max(self._minimum, self._limit * self._backoff)
+            self._stats["decreases"] += 1
+            logger.info(f"Concurrency limit for {self._name} lowered to {self._limit:.2f}")
+
+
+class ModelLimiters:
+    """One AdaptiveLimiter per model, created on first use."""
+
+    def __init__(self, **settings: Any):
+        self._settings = settings
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def get(self, model: str) -> AdaptiveLimiter:
+        """Return the limiter for `model`."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = AdaptiveLimiter(model, **self._settings)
+        return limiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return limiter metrics per model."""
+        return {model: limiter.stats() for model, limiter in self._limiters.items()}
@@ -12,8 +12,148 @@ DEFAULT_COUNCIL_MODELS = [
 # Default chairman model - synthesizes final response
 DEFAULT_CHAIRMAN_MODEL = "gpt-5"
 
+# Deadline in seconds for a single model call
+DEFAULT_MODEL_TIMEOUT = 120.0
+
+# Stage 1 quorum mode - return once this many models have answered (None = all)
+STAGE1_QUORUM = None
+
+# Stage 1 deadline in seconds - return with whatever has arrived (None = no deadline)
+STAGE1_DEADLINE = None
+
+# Cancel Stage 1 stragglers (True) or let them finish in the background (False)
+STAGE1_CANCEL_STRAGGLERS = True
+
+# Stage 2 quorum - parsed rankings needed before the chairman starts (None = all)
+STAGE2_QUORUM = None
+
+# Prompt budgets - Stage 1 responses in the Stage 2 prompt, and responses plus
+# rankings in the Stage 3 prompt, are excerpted to fit in this many tokens, or
+# PROMPT_WINDOW_SHARE of the receiving model's prompt limit if that is lower.
+# Each excerpted section keeps at least PROMPT_SECTION_MIN_TOKENS, even when
+# that overruns the budget.
+STAGE2_PROMPT_MAX_TOKENS = 24000
+STAGE3_PROMPT_MAX_TOKENS = 32000
+PROMPT_WINDOW_SHARE = 0.75
+PROMPT_SECTION_MIN_TOKENS = 100
+
+# Chairman context - "full" gives the chairman every judge's complete ranking
+# text; "compact" gives it the aggregate ranking, each judge's parsed ranking
+# and a digest of each critique of at most CRITIQUE_DIGEST_WORDS words.
+# Compare the two with `python -m backend.benchmark_chairman`.
+CHAIRMAN_CONTEXT = "full"
+CRITIQUE_DIGEST_WORDS = 40
+
+# Per-model adaptive concurrency (AIMD) - the limit starts at INITIAL and moves
+# between MIN and MAX; errors and calls slower than LATENCY_TARGET seconds
+# multiply it by BACKOFF. At most QUEUE_MAX callers wait per model.
+MODEL_CONCURRENCY_INITIAL = 4
+MODEL_CONCURRENCY_MIN = 1
+MODEL_CONCURRENCY_MAX = 16
+MODEL_CONCURRENCY_LATENCY_TARGET = 60.0
+MODEL_CONCURRENCY_BACKOFF = 0.5
+MODEL_QUEUE_MAX = 100
+
+# Retries for failed model calls - up to ATTEMPTS tries in total, with jittered
+# exponential backoff from BASE_DELAY up to MAX_DELAY seconds. No retry is
+# started with less than MIN_BUDGET seconds of the call's deadline left.
+MODEL_RETRY_ATTEMPTS = 3
+MODEL_RETRY_BASE_DELAY = 1.0
+MODEL_RETRY_MAX_DELAY = 10.0
+MODEL_RETRY_MIN_BUDGET = 5.0
+
+# Circuit breaker per model - open after FAILURE_THRESHOLD consecutive failed
+# calls, refuse calls for RESET_TIMEOUT seconds, then let PROBES calls through
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 30.0
+CIRCUIT_HALF_OPEN_PROBES = 1
+
+# Hedged chairman and title calls - if the chairman has produced no output by
+# the HEDGE_PERCENTILE of its recent time to first output, also ask
+# HEDGE_BACKUP_MODEL and keep whichever answers first (None = no hedging).
+# Percentiles come from the last HEDGE_WINDOW calls, once there are
+# HEDGE_MIN_SAMPLES of them.
+HEDGE_BACKUP_MODEL = None
+HEDGE_PERCENTILE = 0.95
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+
+# Token streaming - flush buffered deltas after this many seconds or characters
+STREAM_COALESCE_INTERVAL = 0.05
+STREAM_COALESCE_CHARS = 256
+
+# Events buffered per query_model_stream() consumer before deltas are merged
+STREAM_QUEUE_SIZE = 64
+
+# Response cache - reuse answers to identical prompts sent to the same model
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_TTL = 3600.0
+RESPONSE_CACHE_MAX_ENTRIES = 512
+RESPONSE_CACHE_DIR = "data/cache"
+RESPONSE_CACHE_DISK_MAX_BYTES = 64 * 1024 * 1024
+
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
 
+# Metadata index for the JSON backend, so listing does not parse every file
+CONVERSATION_INDEX_FILE = "data/conversation_index.jsonl"
+
+# Conversation storage backend: "json" (one file per conversation) or "sqlite"
+STORAGE_BACKEND = "json"
+
+# SQLite database path (used when STORAGE_BACKEND = "sqlite")
+SQLITE_PATH = "data/council.db"
+
+# Worker threads for blocking storage I/O
+STORAGE_THREADS = 4
+
+# Event-loop lag sampling interval in seconds
+LOOP_LAG_INTERVAL = 0.5
+
 # Settings file path
 SETTINGS_FILE = "data/settings.json"
+
+# Seconds between background refreshes of the available model list
+MODEL_CATALOG_TTL = 600.0
+
+# Seconds warm-up waits for the first model list before moving on without it
+STARTUP_DISCOVERY_TIMEOUT = 15.0
+
+# Seconds warm-up gives the Copilot clients to start before retrying
+CLIENT_START_TIMEOUT = 30.0
+
+# Copilot client pool - each client runs its own CLI process; calls go to the
+# least-loaded one. A watchdog pings every client each CLIENT_HEALTH_INTERVAL
+# seconds and restarts one that has died or missed CLIENT_PING_FAILURES pings
+# in a row, backing off up to CLIENT_MAX_RESTART_BACKOFF seconds between
+# failed restarts.
+COPILOT_CLIENTS = 1
+CLIENT_HEALTH_INTERVAL = 10.0
+CLIENT_PING_TIMEOUT = 5.0
+CLIENT_PING_FAILURES = 2
+CLIENT_MAX_RESTART_BACKOFF = 60.0
+
+# Session pool - warm Copilot sessions kept ready per model and client
+SESSION_POOL_MAX_SIZE = 2
+SESSION_POOL_IDLE_TIMEOUT = 300.0
+
+# Conversation sessions - a live session per (conversation, model) so that
+# follow-up turns send only the new message. Beyond CONVERSATION_SESSIONS_MAX
+# the least recently used are closed, as is any idle for
+# CONVERSATION_SESSION_IDLE_TIMEOUT seconds; the next turn rebuilds it from
+# the stored history.
+CONVERSATION_SESSIONS_MAX = 64
+CONVERSATION_SESSION_IDLE_TIMEOUT = 900.0
+
+# Conversation context sent to Stage 1 with a follow-up question. Recent
+# turns go verbatim within CONTEXT_MAX_TOKENS, or CONTEXT_WINDOW_SHARE of the
+# smallest council model's prompt limit if that is lower; older turns are
+# replaced by a rolling summary. After each turn, messages older than the
+# last CONTEXT_RECENT_MESSAGES are folded into the summary in the background
+# by CONTEXT_SUMMARY_MODEL (None = the chairman). The Stage 2 judges and the
+# chairman get the summary and the last exchange within their prompt budgets.
+CONTEXT_MAX_TOKENS = 8000
+CONTEXT_WINDOW_SHARE = 0.25
+CONTEXT_RECENT_MESSAGES = 6
+CONTEXT_SUMMARY_MAX_WORDS = 300
+CONTEXT_SUMMARY_MODEL = None
@@ -0,0 +1,250 @@
+"""Conversation context for follow-up questions: recent turns plus a rolling summary."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from . import async_storage as storage
+from .concurrency import PRIORITY_LOW
+from .config import (
+    DEFAULT_COUNCIL_MODELS,
+    DEFAULT_CHAIRMAN_MODEL,
+    CONTEXT_MAX_TOKENS,
+    CONTEXT_WINDOW_SHARE,
+    CONTEXT_RECENT_MESSAGES,
+    CONTEXT_SUMMARY_MAX_WORDS,
+    CONTEXT_SUMMARY_MODEL,
+)
+from .copilot_client import catalog, query_model
+from .tokens import (
+    MESSAGE_OVERHEAD_TOKENS,
+    estimate_message_tokens,
+    estimate_tokens,
+    excerpt,
+    truncate_to_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest excerpt of a single message fed to the summarizer
+SUMMARY_INPUT_MESSAGE_TOKENS = 1500
+
+# Wording of the leading message that stands in for earlier turns
+_SUMMARY_NOTE = "Summary of the earlier conversation:\n"
+_GAP_NOTE = "\n(A few turns after this summary are not shown.)"
+
+# Smallest excerpt of an over-long recent message worth sending
+MIN_EXCERPT_TOKENS = 50
+
+# Summary updates running in the background, by conversation
+_summary_tasks: Dict[str, asyncio.Task] = {}
+
+
+def conversation_history(stored_messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Turn a stored conversation into the messages the council sees as context.
+
+    Each user message is kept, and each council turn is represented by the
+    chairman's final answer. Turns without a final answer are left out.
+
+    Args:
+        stored_messages: The conversation's 'messages' as stored
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
+    history = []
+    for message in stored_messages:
+        if message.get('role') == 'user':
+            history.append({"role": "user", "content": message['content']})
+        else:
+            final = (message.get('stage3') or {}).get('response')
+            if final:
+                history.append({"role": "assistant", "content": final})
+    return history
+
+
+def history_budget(models: List[str]) -> int:
+    """
+    Tokens of earlier conversation that may go to the given models:
+    CONTEXT_MAX_TOKENS, or CONTEXT_WINDOW_SHARE of the smallest prompt limit
+    in the model catalog if that is lower.
+    """
+    budget = CONTEXT_MAX_TOKENS
+    for model in models or DEFAULT_COUNCIL_MODELS:
+        limit = catalog.max_prompt_tokens(model)
+        if limit:
+            budget = min(budget, int(limit * CONTEXT_WINDOW_SHARE))
+    return budget
+
+
+def build_context(
+    conversation: Dict[str, Any],
+    models: List[str],
+    user_query: str
+) -> List[Dict[str, Any]]:
+    """
+    Pack a conversation's earlier turns into the budget for `models`.
+
+    The whole history is sent when it fits. Otherwise the newest messages
+    are kept verbatim, the newest turn excerpted if it is too long on its
+    own, and everything before them is replaced by a leading
+    'system' message holding the rolling summary. That message carries
+    'turns', the number of user turns it stands in for, so a conversation
+    session can tell how far the conversation has got (see
+    copilot_client.query_model).
+
+    Args:
+        conversation: Stored conversation, with 'messages' and optional 'summary'
+        models: Models the context will be sent to
+        user_query: The new question, which shares the budget
+
+    Returns:
+        Messages to send before the new user turn
+    """
+    history = conversation_history(conversation["messages"])
+    budget = history_budget(models) - estimate_tokens(user_query)
+    if estimate_message_tokens(history) <= budget:
+        return history
+
+    summary = conversation.get("summary") or {}
+    covered = min(summary.get("messages", 0), len(history))
+    summary_text = summary.get("text", "") if covered else ""
+    # The leading note's framing and wording, at its longest
+    budget -= MESSAGE_OVERHEAD_TOKENS + estimate_tokens(_SUMMARY_NOTE + _GAP_NOTE)
+    if summary_text:
+        summary_text = truncate_to_tokens(summary_text, budget // 2)
+        budget -= estimate_tokens(summary_text)
+
+    # Walk back from the newest message; anything the summary covers is not
+    # worth its verbatim cost
+    start = len(history)
+    shortened: Dict[int, Dict[str, str]] = {}
+    while start > covered:
+        message = history[start - 1]
+        cost = estimate_message_tokens([message])
+        if cost > budget:
+            # Excerpt rather than drop the newest answer, and the question
+            # that whatever is kept replies to
+            needed = start == len(history) or history[start]['role'] != 'user'
+            room = budget - MESSAGE_OVERHEAD_TOKENS
+            if message['role'] != 'user':
+                # Leave room for the question before it
+                room = room * 2 // 3
+            if not needed or room < MIN_EXCERPT_TOKENS:
+                break
+            message = {**message, "content": excerpt(message['content'], room)}
+            shortened[start - 1] = message
+            cost = estimate_message_tokens([message])
+        budget -= cost
+        start -= 1
+    # Open the verbatim part on a question, not on a dangling answer
+    while start < len(history) and history[start]['role'] != 'user':
+        start += 1
+
+    if summary_text:
+        note = _SUMMARY_NOTE + summary_text
+        if covered < start:
+            note += _GAP_NOTE
+    else:
+        note = "Earlier turns of this conversation are not shown."
+    omitted_turns = sum(1 for msg in history[:start] if msg['role'] == 'user')
+    recent = [shortened.get(i, history[i]) for i in range(start, len(history))]
+    return [{"role": "system", "content": note, "turns": omitted_turns}] + recent
+
+
+def review_context(history: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Condense packed history for the Stage 2 judges and the chairman: the
+    rolling summary, if there is one, and the last exchange.
+
+    Args:
+        history: Messages from build_context()
+
+    Returns:
+        Text to show before the question, or "" for a first turn
+    """
+    if not history:
+        return ""
+    parts = []
+    if history[0]['role'] == 'system' and history[0]['content'].startswith(_SUMMARY_NOTE):
+        parts.append(history[0]['content'])
+    last_question = max(
+        (i for i, msg in enumerate(history) if msg['role'] == 'user'),
+        default=None
+    )
+    if last_question is not None:
+        parts.append("\n\n".join(
+            f"{'User' if msg['role'] == 'user' else 'Council'}: {msg['content']}"
+            for msg in history[last_question:]
+        ))
+    return "\n\n".join(parts)
+
+
+def schedule_summary_update(conversation_id: str, model: Optional[str] = None) -> None:
+    """
+    Bring the conversation's rolling summary up to date in the background,
+    unless an update for it is already running.
+
+    Args:
+        conversation_id: Conversation to summarize
+        model: Model to summarize with when CONTEXT_SUMMARY_MODEL is not set
+    """
+    if conversation_id in _summary_tasks:
+        return
+    task = asyncio.create_task(update_summary(conversation_id, model))
+    _summary_tasks[conversation_id] = task
+    task.add_done_callback(lambda _: _summary_tasks.pop(conversation_id, None))
+
+
+async def update_summary(conversation_id: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fold messages that have left the last CONTEXT_RECENT_MESSAGES into the
+    conversation's rolling summary and store it.
+
+    The previous summary is extended rather than rewritten from scratch, so
+    each update reads only the newly aged-out messages. A failed update
+    leaves the stored summary as it was; the next turn tries again.
+
+    Returns:
+        The summary now stored, or None if the conversation does not exist
+    """
+    conversation = await storage.get_conversation(conversation_id)
+    if conversation is None:
+        return None
+
+    history = conversation_history(conversation["messages"])
+    summary = conversation.get("summary") or {"text": "", "messages": 0}
+    target = len(history) - CONTEXT_RECENT_MESSAGES
+    if target <= summary["messages"]:
+        return summary
+
+    prompt = _build_summary_prompt(summary["text"], history[summary["messages"]:target])
+    summary_model = CONTEXT_SUMMARY_MODEL or model or DEFAULT_CHAIRMAN_MODEL
+    response = await query_model(summary_model, [{"role": "user", "content": prompt}], priority=PRIORITY_LOW)
+    if response.get('error'):
+        logger.warning(f"Failed to update summary of {conversation_id}: {response['error']}")
+        return summary
+
+    updated = {"text": response['content'].strip(), "messages": target}
+    await storage.update_conversation_summary(conversation_id, updated)
+    return updated
+
+
+def _build_summary_prompt(previous: str, messages: List[Dict[str, str]]) -> str:
+    """Build the prompt that extends a summary with newly aged-out messages."""
+    transcript = "\n\n".join(
+        f"{'User' if msg['role'] == 'user' else 'Council'}: "
+        f"{truncate_to_tokens(msg['content'], SUMMARY_INPUT_MESSAGE_TOKENS)}"
+        for msg in messages
+    )
+    existing = previous or "(none yet)"
+    return f"""You maintain a running summary of a conversation between a user and an AI council.
+
+Summary so far:
+{existing}
+
+New messages to fold in:
+{transcript}
+
+Write the updated summary in at most {CONTEXT_SUMMARY_MAX_WORDS} words. Keep the user's goals, constraints, decisions and any facts or definitions later questions may refer to; drop pleasantries and detail that no longer matters. Reply with the summary only."""
@@ -0,0 +1,198 @@
+"""Live Copilot sessions kept per conversation and model."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .session_pool import ABORT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+EntryKey = Tuple[str, str]
+
+
+class ConversationSession:
+    """One conversation's session with one model."""
+
+    __slots__ = ("key", "session", "client", "shard", "turns", "last_used", "users", "lock")
+
+    def __init__(self, key: EntryKey):
+        self.key = key
+        self.session: Any = None
+        self.client: Any = None
+        self.shard: Any = None
+        # User turns the session has answered so far
+        self.turns = 0
+        self.last_used = time.monotonic()
+        self.users = 0
+        self.lock = asyncio.Lock()
+
+
+class ConversationSessions:
+    """
+    Keeps a live session per (conversation_id, model) so that a follow-up
+    turn only sends the new message; the session already holds the rest of
+    the conversation.
+
+    At most `max_entries` sessions are kept. Past that the least recently
+    used idle ones are closed, and a background loop closes any left unused
+    for `idle_timeout` seconds. A conversation whose session was closed, or
+    has fallen behind the stored history, is rebuilt from that history on
+    its next turn. Turns of the same conversation and model run one at a
+    time.
+    """
+
+    def __init__(self, max_entries: int, idle_timeout: float):
+        self._max_entries = max_entries
+        self._idle_timeout = idle_timeout
+        self._entries: "OrderedDict[EntryKey, ConversationSession]" = OrderedDict()
+        self._background: Set[asyncio.Task] = set()
+        self._reaper: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {
+            "resumed": 0,
+            "rebuilt": 0,
+            "evicted": 0,
+            "expired": 0,
+        }
+
+    def start(self) -> None:
+        """Start the background idle-expiry loop."""
+        self._closed = False
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def close(self) -> None:
+        """Stop background work and destroy every live session."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+        for entry in self._entries.values():
+            if entry.session is not None:
+                await _destroy(entry.session)
+                entry.session = None
+        self._entries.clear()
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def acquire(self, conversation_id: str, model: str, turns: int) -> ConversationSession:
+        """
+        Take the conversation's entry for one turn, waiting for any turn
+        already in progress.
+
+        Args:
+            conversation_id: Conversation the turn belongs to
+            model: Copilot model identifier
+            turns: User turns in the stored history before this one
+
+        Returns:
+            The entry; its 'session' is None when the turn has to start a
+            new session from the full history. Hand it back with release().
+        """
+        key = (conversation_id, model)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = ConversationSession(key)
+        self._entries.move_to_end(key)
+        entry.users += 1
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            entry.users -= 1
+            raise
+
+        if entry.session is not None and entry.turns == turns and self._is_connected(entry):
+            self._stats["resumed"] += 1
+        else:
+            self.discard(entry)
+            if turns:
+                self._stats["rebuilt"] += 1
+        return entry
+
+    def release(self, entry: ConversationSession, keep: bool, abort: bool = False) -> None:
+        """
+        Finish a turn started with acquire().
+
+        Pass keep=False when the turn failed, since the session's history is
+        then unknown; it is destroyed in the background, after aborting the
+        in-flight request when abort=True.
+        """
+        if not keep:
+            self.discard(entry, abort)
+        entry.last_used = time.monotonic()
+        entry.users -= 1
+        entry.lock.release()
+        if entry.session is None and entry.users == 0:
+            self._entries.pop(entry.key, None)
+        self._evict_over_capacity()
+
+    def discard(self, entry: ConversationSession, abort: bool = False) -> None:
+        """Drop the entry's session, if any, so the next turn starts afresh."""
+        if entry.session is not None:
+            self._spawn(_destroy(entry.session, abort))
+        entry.session = None
+        entry.client = None
+        entry.shard = None
+        entry.turns = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of live sessions and resume/rebuild/eviction counters."""
+        return {
+            **self._stats,
+            "live": sum(1 for entry in self._entries.values() if entry.session is not None),
+            "max_entries": self._max_entries,
+        }
+
+    def _is_connected(self, entry: ConversationSession) -> bool:
+        get_state = getattr(entry.client, "get_state", None)
+        return get_state is None or get_state() == "connected"
+
+    def _evict_over_capacity(self) -> None:
+        excess = len(self._entries) - self._max_entries
+        if excess <= 0:
+            return
+        # Oldest first; entries with a turn in progress or queued are kept
+        for key, entry in list(self._entries.items()):
+            if excess <= 0:
+                break
+            if entry.users:
+                continue
+            del self._entries[key]
+            self.discard(entry)
+            self._stats["evicted"] += 1
+            excess -= 1
+
+    async def _reap_idle(self) -> None:
+        interval = max(self._idle_timeout / 2, 1.0)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self._idle_timeout
+            for key, entry in list(self._entries.items()):
+                if entry.users == 0 and entry.last_used < cutoff:
+                    del self._entries[key]
+                    self.discard(entry)
+                    self._stats["expired"] += 1
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+async def _destroy(session: Any, abort: bool = False) -> None:
+    if abort:
+        try:
+            await asyncio.wait_for(session.abort(), timeout=ABORT_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Failed to abort conversation session: {e}")
+    try:
+        await session.destroy()
+    except Exception as e:
+        logger.debug(f"Failed to destroy conversation session: {e}")
@@ -2,48 +2,303 @@
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Callable
+import time
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple, AsyncIterator
 
 from copilot import CopilotClient
 
-from .config import DEFAULT_COUNCIL_MODELS, DEFAULT_CHAIRMAN_MODEL
+from .config import (
+    DEFAULT_COUNCIL_MODELS,
+    DEFAULT_CHAIRMAN_MODEL,
+    DEFAULT_MODEL_TIMEOUT,
+    MODEL_CONCURRENCY_INITIAL,
+    MODEL_CONCURRENCY_MIN,
+    MODEL_CONCURRENCY_MAX,
+    MODEL_CONCURRENCY_LATENCY_TARGET,
+    MODEL_CONCURRENCY_BACKOFF,
+    MODEL_QUEUE_MAX,
+    MODEL_RETRY_ATTEMPTS,
+    MODEL_RETRY_BASE_DELAY,
+    MODEL_RETRY_MAX_DELAY,
+    MODEL_RETRY_MIN_BUDGET,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_HALF_OPEN_PROBES,
+    HEDGE_BACKUP_MODEL,
+    HEDGE_PERCENTILE,
+    HEDGE_WINDOW,
+    HEDGE_MIN_SAMPLES,
+    MODEL_CATALOG_TTL,
+    STARTUP_DISCOVERY_TIMEOUT,
+    CLIENT_START_TIMEOUT,
+    STREAM_QUEUE_SIZE,
+    COPILOT_CLIENTS,
+    CLIENT_HEALTH_INTERVAL,
+    CLIENT_PING_TIMEOUT,
+    CLIENT_PING_FAILURES,
+    CLIENT_MAX_RESTART_BACKOFF,
+    SESSION_POOL_MAX_SIZE,
+    SESSION_POOL_IDLE_TIMEOUT,
+    CONVERSATION_SESSIONS_MAX,
+    CONVERSATION_SESSION_IDLE_TIMEOUT,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_DISK_MAX_BYTES,
+)
+from .circuit_breaker import CircuitBreakers
+from .model_catalog import ModelCatalog
+from .hedging import LatencyTracker, hedged_call
+from .concurrency import ModelLimiters, PRIORITY_NORMAL, QueueFull
+from .response_cache import ResponseCache
+from .retry import (
+    RetryPolicy,
+    ERROR_CIRCUIT_OPEN,
+    ERROR_FATAL,
+    ERROR_OVERLOADED,
+    ERROR_TIMEOUT,
+    ERROR_TRANSIENT,
+    is_retryable,
+)
+from .client_pool import ClientPool
+from .conversation_sessions import ConversationSessions
+from .single_flight import SingleFlight
+from .streaming import stream_events
 
 logger = logging.getLogger(__name__)
 
-# Singleton client instance
-_client: Optional[CopilotClient] = None
-_available_models: List[Dict[str, Any]] = []
+# Singleton pool of client instances
+_clients: Optional[ClientPool] = None
+
+_response_cache: Optional[ResponseCache] = (
+    ResponseCache(
+        RESPONSE_CACHE_MAX_ENTRIES,
+        RESPONSE_CACHE_TTL,
+        RESPONSE_CACHE_DIR,
+        RESPONSE_CACHE_DISK_MAX_BYTES
+    )
+    if RESPONSE_CACHE_ENABLED else None
+)
+
+_single_flight = SingleFlight()
+
+_conversations = ConversationSessions(CONVERSATION_SESSIONS_MAX, CONVERSATION_SESSION_IDLE_TIMEOUT)
+
+_limiters = ModelLimiters(
+    initial=MODEL_CONCURRENCY_INITIAL,
+    minimum=MODEL_CONCURRENCY_MIN,
+    maximum=MODEL_CONCURRENCY_MAX,
+    latency_target=MODEL_CONCURRENCY_LATENCY_TARGET,
+    backoff=MODEL_CONCURRENCY_BACKOFF,
+    max_queue=MODEL_QUEUE_MAX
+)
+
+_retry_policy = RetryPolicy(
+    MODEL_RETRY_ATTEMPTS,
+    MODEL_RETRY_BASE_DELAY,
+    MODEL_RETRY_MAX_DELAY,
+    MODEL_RETRY_MIN_BUDGET
+)
+
+_breakers = CircuitBreakers(
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_HALF_OPEN_PROBES
+)
+
+_latency = LatencyTracker(HEDGE_WINDOW, HEDGE_MIN_SAMPLES)
+
+
+# Private attribute in which github-copilot-sdk 0.1.x caches list_models()
+# for the life of the connection. Checked against 0.1.25.
+_SDK_MODELS_CACHE_ATTR = "_models_cache"
+_warned_models_cache = False
+
+
+def _clear_sdk_models_cache(client: Any) -> None:
+    """
+    Drop the SDK's cached model list so a catalog refresh sees subscription
+    changes. Warns once if the SDK no longer has the cache where expected,
+    since refreshes would then keep returning the first list.
+    """
+    global _warned_models_cache
+
+    if hasattr(client, _SDK_MODELS_CACHE_ATTR):
+        setattr(client, _SDK_MODELS_CACHE_ATTR, None)
+    elif not _warned_models_cache:
+        _warned_models_cache = True
+        logger.warning(
+            f"Copilot SDK client has no {_SDK_MODELS_CACHE_ATTR} attribute; model catalog "
+            f"refreshes may keep serving a stale list. Check the SDK version."
+        )
+
+
+async def _fetch_models() -> List[Any]:
+    client = _clients.client
+    _clear_sdk_models_cache(client)
+    return await client.list_models()
+
+
+catalog = ModelCatalog(_fetch_models, MODEL_CATALOG_TTL)
+
+# Background warm-up started by start_client()
+_startup_task: Optional[asyncio.Task] = None
+_clients_started = asyncio.Event()
+_startup: Dict[str, Any] = {
+    "clients": "pending",
+    "models": "pending",
+    "sessions": "pending",
+    "attempts": 0,
+    "error": None,
+    "started_at": None,
+    "ready_at": None,
+}
+
+# Straggler queries left running after a quorum/deadline return
+_background_tasks: Set[asyncio.Task] = set()
 
 
 async def start_client() -> None:
-    """Start the Copilot client. Called once at app startup."""
-    global _client, _available_models
+    """
+    Begin starting the Copilot clients. Called once at app startup.
+
+    Returns immediately; clients, the model catalog and warm sessions come
+    up in the background so the server can accept requests at once.
+    Progress is reported by get_startup_status(), and model calls made
+    before the clients are up wait for them within their own deadline.
+    """
+    global _startup_task
+
+    if _startup_task is None:
+        _startup["started_at"] = time.time()
+        _startup_task = asyncio.create_task(_warm_up())
+        _conversations.start()
 
-    if _client is not None:
-        return
 
-    _client = CopilotClient()
-    await _client.start()
+async def _warm_up() -> None:
+    """Start the clients (retrying with backoff), then load models and warm sessions."""
+    global _clients
 
-    # Fetch available models
+    backoff = 1.0
+    while _clients is None:
+        _startup["clients"] = "starting"
+        _startup["attempts"] += 1
+        clients = ClientPool(
+            CopilotClient,
+            COPILOT_CLIENTS,
+            SESSION_POOL_MAX_SIZE,
+            SESSION_POOL_IDLE_TIMEOUT,
+            CLIENT_HEALTH_INTERVAL,
+            CLIENT_PING_TIMEOUT,
+            CLIENT_PING_FAILURES,
+            CLIENT_MAX_RESTART_BACKOFF
+        )
+        try:
+            # A CLI that hangs on start would otherwise stall warm-up for good.
+            # Cancelling the start is safe: the pool stops any client it had
+            # launched before the error reaches us.
+            await asyncio.wait_for(clients.start(), timeout=CLIENT_START_TIMEOUT)
+            _clients = clients
+        except Exception as e:
+            await clients.close()
+            _startup["clients"] = "failed"
+            if isinstance(e, asyncio.TimeoutError):
+                _startup["error"] = f"Client start took over {CLIENT_START_TIMEOUT}s"
+            else:
+                _startup["error"] = str(e) or type(e).__name__
+            logger.error(f"Failed to start Copilot client, retrying in {backoff:.0f}s: {_startup['error']}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, CLIENT_MAX_RESTART_BACKOFF)
+
+    _startup["clients"] = "ready"
+    _startup["error"] = None
+    _startup["ready_at"] = time.time()
+    _clients_started.set()
+    logger.info("Copilot client started")
+
+    # The clients are up, so a failure from here on only costs the catalog
+    # or warm sessions; record it rather than losing it with the task
+    step = "models"
     try:
-        _available_models = await _client.list_models()
-        logger.info(f"Available models: {[m['id'] for m in _available_models]}")
+        # Fetch available models, then keep them fresh in the background. A hung
+        # discovery call must not hold up warm-up; the refresh loop retries it.
+        _startup["models"] = "loading"
+        try:
+            loaded = await asyncio.wait_for(catalog.refresh(), timeout=STARTUP_DISCOVERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Model discovery took over {STARTUP_DISCOVERY_TIMEOUT}s; continuing without it")
+            loaded = False
+        catalog.start()
+        _startup["models"] = "ready" if loaded else "retrying"
+        if not loaded:
+            _startup["sessions"] = "skipped"
+            return
+
+        # Validate default models at startup
+        step = "sessions"
+        validation = await validate_models()
+
+        # Pre-warm sessions for the default council so the first run skips setup
+        _startup["sessions"] = "warming"
+        available_defaults = [m for m, ok in validation.items() if ok]
+        await _clients.warm(available_defaults)
+        await _clients.warm(available_defaults, streaming=True)
+        _startup["sessions"] = "ready"
     except Exception as e:
-        logger.error(f"Failed to fetch models: {e}")
-        _available_models = []
+        _startup[step] = "failed"
+        _startup["error"] = str(e) or type(e).__name__
+        logger.error(f"Copilot warm-up failed while loading {step}: {_startup['error']}")
+        if step == "models":
+            # Let the background refresh keep trying
+            catalog.start()
+            _startup["sessions"] = "skipped"
+
+
+def is_ready() -> bool:
+    """Return True once the clients are up and model calls can be served."""
+    return _clients is not None
+
+
+def get_startup_status() -> Dict[str, Any]:
+    """
+    Get warm-up progress.
 
-    # Validate default models at startup
-    await validate_models()
+    Returns:
+        Dict with 'ready' and the state of each warm-up step: 'clients',
+        'models' (catalog) and 'sessions' (pre-warmed sessions)
+    """
+    status = dict(_startup)
+    if _startup["models"] == "retrying" and catalog.loaded:
+        status["models"] = "ready"
+    return {"ready": is_ready(), **status}
 
 
 async def stop_client() -> None:
-    """Stop the Copilot client. Called at app shutdown."""
-    global _client
+    """Stop the Copilot clients. Called at app shutdown."""
+    global _clients, _startup_task
+
+    if _startup_task is not None:
+        _startup_task.cancel()
+        try:
+            await _startup_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _startup_task = None
+    _clients_started.clear()
 
-    if _client is not None:
-        await _client.stop()
-        _client = None
+    # Let cancelled stragglers unwind before the pool they release into goes away
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    await catalog.close()
+    await _conversations.close()
+
+    if _clients is not None:
+        await _clients.close()
+        _clients = None
 
 
 async def validate_models() -> Dict[str, bool]:
@@ -54,13 +309,12 @@ async def validate_models() -> Dict[str, bool]:
     Returns:
         Dict mapping model ID to availability status
     """
-    available_ids = {m['id'] for m in _available_models}
     validation = {}
 
     all_defaults = set(DEFAULT_COUNCIL_MODELS) | {DEFAULT_CHAIRMAN_MODEL}
 
     for model_id in all_defaults:
-        is_available = model_id in available_ids
+        is_available = model_id in catalog
         validation[model_id] = is_available
         if not is_available:
             logger.warning(f"Default model '{model_id}' is not available in your Copilot subscription")
@@ -70,19 +324,119 @@ async def validate_models() -> Dict[str, bool]:
 
 def get_available_models() -> List[Dict[str, Any]]:
     """
-    Get list of available models.
+    Get list of available models from the current catalog snapshot.
 
     Returns:
         List of model info dicts with 'id', 'name', 'capabilities', etc.
     """
-    return _available_models
+    return catalog.models
+
+
+def get_catalog_stats() -> Dict[str, Any]:
+    """
+    Get model catalog metrics.
+
+    Returns:
+        Dict with the catalog generation, model count, snapshot age and last refresh error
+    """
+    return catalog.stats()
+
+
+def get_model_health(model: str) -> Dict[str, Any]:
+    """
+    Get the circuit breaker state for a model.
+
+    Returns:
+        Dict with 'state' ('closed', 'open' or 'half_open'), consecutive
+        failures, seconds until the next probe, and the last error
+    """
+    return _breakers.snapshot(model)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get response cache metrics.
+
+    Returns:
+        Dict with hit/miss counters, hit rate and tier sizes
+    """
+    if _response_cache is None:
+        return {}
+    return _response_cache.stats()
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    """
+    Get single-flight coalescing metrics.
+
+    Returns:
+        Dict with leader/joiner counters and calls currently in flight
+    """
+    return _single_flight.stats()
+
+
+def get_concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get per-model concurrency limiter metrics.
+
+    Returns:
+        Dict mapping model ID to its current limit, in-flight count,
+        queue depth and wait times
+    """
+    return _limiters.stats()
+
+
+def get_retry_stats() -> Dict[str, Any]:
+    """
+    Get retry policy metrics.
+
+    Returns:
+        Dict with retry, recovery and exhaustion counters
+    """
+    return _retry_policy.stats()
+
+
+def get_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get time-to-first-output percentiles per model.
+
+    Returns:
+        Dict mapping model (and streaming mode) to sample count and p50/p95/p99 seconds
+    """
+    return _latency.stats()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get client pool metrics.
+
+    Returns:
+        Dict with per-client load, health, restarts and session pool counters
+    """
+    if _clients is None:
+        return {}
+    return _clients.stats()
+
+
+def get_conversation_session_stats() -> Dict[str, Any]:
+    """
+    Get conversation session metrics.
+
+    Returns:
+        Dict with the number of live sessions and how many turns resumed a
+        session, rebuilt one from history, or lost theirs to eviction/expiry
+    """
+    return _conversations.stats()
 
 
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
     streaming_callback: Optional[Callable[[str], None]] = None,
-    timeout: float = 120.0
+    timeout: float = DEFAULT_MODEL_TIMEOUT,
+    use_cache: bool = True,
+    priority: int = PRIORITY_NORMAL,
+    conversation_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Query a single model via Copilot SDK.
@@ -91,118 +445,561 @@ async def query_model(
         model: Copilot model identifier (e.g., "gpt-5", "claude-sonnet-4.5")
         messages: List of message dicts with 'role' and 'content'
         streaming_callback: Optional callback for streaming token deltas
-        timeout: Request timeout in seconds (not directly supported, for compatibility)
+        timeout: Deadline in seconds for the whole call, including session setup,
+            queueing and retries. On expiry the in-flight request is aborted
+            and a timeout error returned.
+        use_cache: Serve identical earlier prompts from the response cache and
+            store this answer in it. Pass False to always ask the model.
+        priority: Queue priority class when the model is at its concurrency
+            limit (see backend.concurrency); lower values are served first.
+        conversation_id: Keep a live session for this conversation and model
+            (see backend.conversation_sessions). `messages` is then the
+            conversation so far ending with the new user turn; only that turn
+            is sent when the session has seen the rest. A message with a
+            'turns' key (e.g. a summary) stands in for that many earlier user
+            turns. Follow-up turns bypass the response cache; a first turn
+            goes through it like any other call, and the conversation's
+            session is started on the next turn.
 
     Returns:
-        Response dict with 'content', 'error' (if failed), and 'model'
+        Response dict with 'content', 'error' (if failed), 'model', and
+        'attempts' (the number of upstream calls made; 0 for cache hits).
+        Failures carry an 'error_type' from backend.retry; timeouts also carry
+        the 'timeout' that was hit. Calls refused because the model's circuit
+        breaker is open return at once with 'status': 'skipped'. Cache hits
+        carry 'cached': True.
     """
-    global _client
+    if _clients is None:
+        if _startup_task is None:
+            return {
+                'model': model,
+                'content': None,
+                'error': 'Copilot client not initialized',
+                'error_type': ERROR_FATAL,
+                'attempts': 0
+            }
+        # Still warming up: wait for the clients within this call's deadline
+        loop = asyncio.get_running_loop()
+        waited_from = loop.time()
+        try:
+            await asyncio.wait_for(_clients_started.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {
+                'model': model,
+                'content': None,
+                'error': f'Copilot client still starting after {timeout}s',
+                'error_type': ERROR_TRANSIENT,
+                'attempts': 0
+            }
+        timeout -= loop.time() - waited_from
+
+    # Convert messages to prompt format
+    # The SDK expects a single prompt, so we format the conversation
+    prompt = _format_messages_to_prompt(messages)
+
+    if conversation_id is not None and _conversation_turns(messages) > 0:
+        # The answer depends on the conversation's session, so neither the
+        # cache nor coalescing applies
+        return await _query_upstream(
+            model, prompt, streaming_callback, timeout, None, priority,
+            conversation=(conversation_id, messages)
+        )
 
-    if _client is None:
+    key = ResponseCache.key(model, prompt)
+    if use_cache and _response_cache is not None:
+        cached = await _response_cache.get(key)
+        if cached is not None:
+            if streaming_callback:
+                streaming_callback(cached)
+            return {
+                'model': model,
+                'content': cached,
+                'cached': True,
+                'attempts': 0
+            }
+
+    # Identical concurrent queries share one upstream call. Only calls with
+    # the same priority and cache setting are coalesced, so an urgent caller
+    # never queues behind a background one, and a joiner gives up at its own
+    # deadline rather than the leader's.
+    try:
+        return await _single_flight.run(
+            f"{key}:{priority}:{use_cache:d}",
+            lambda publish: _query_upstream(model, prompt, publish, timeout, key if use_cache else None, priority),
+            streaming_callback,
+            timeout
+        )
+    except asyncio.TimeoutError:
+        shown = round(timeout, 1)
+        logger.warning(f"Model {model} timed out after {shown}s waiting on an identical query")
         return {
             'model': model,
             'content': None,
-            'error': 'Copilot client not initialized'
+            'error': f'Timeout after {shown}s',
+            'error_type': ERROR_TIMEOUT,
+            'timeout': shown,
+            'attempts': 0
         }
 
+
+async def query_model_stream(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = DEFAULT_MODEL_TIMEOUT,
+    use_cache: bool = True,
+    priority: int = PRIORITY_NORMAL,
+    max_buffered: int = STREAM_QUEUE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a single model's answer as an async iterator of typed events.
+
+    Args:
+        model: Copilot model identifier
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Deadline in seconds for the whole call, as for query_model
+        use_cache: As for query_model; a cache hit arrives as a single delta
+        priority: Queue priority class, as for query_model
+        max_buffered: Most events held for a slow consumer before further
+            deltas are merged into one
+
+    Yields:
+        Event dicts with 'type' and 'model':
+        - 'delta': 'delta' holds the next piece of text
+        - 'usage': 'usage' holds token counts, when the model reported them
+        - 'done': 'response' holds the full query_model response
+        - 'error': 'error' and 'error_type' describe the failure
+        'done' or 'error' is always the last event. Stopping early (break,
+        aclose() or cancelling the consumer) aborts the request.
+    """
+    async for event in stream_events(
+        model,
+        lambda callback: query_model(model, messages, callback, timeout, use_cache, priority),
+        max_buffered
+    ):
+        yield event
+
+
+async def query_model_hedged(
+    model: str,
+    messages: List[Dict[str, str]],
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    backup_model: Optional[str] = HEDGE_BACKUP_MODEL,
+    timeout: float = DEFAULT_MODEL_TIMEOUT,
+    priority: int = PRIORITY_NORMAL
+) -> Dict[str, Any]:
+    """
+    Query a model, hedging with a backup model if it is slow to start.
+
+    Once enough calls to `model` have been seen, the backup is fired when
+    the primary has produced no output by the HEDGE_PERCENTILE of its
+    recent time to first output. Whichever answers first is kept and the
+    other cancelled. Until then, or without a backup, this is query_model.
+
+    Args:
+        model: Primary Copilot model identifier
+        messages: List of message dicts with 'role' and 'content'
+        streaming_callback: Optional callback for the winner's token deltas
+        backup_model: Model to hedge with (None disables hedging)
+        timeout: Deadline in seconds for each of the two calls
+        priority: Queue priority class for both calls
+
+    Returns:
+        Response dict as from query_model. 'model' names the model that
+        answered, and 'hedged' is True if the backup was fired.
+    """
+    streaming = streaming_callback is not None
+    delay = _latency.threshold(model, streaming, HEDGE_PERCENTILE)
+    if not backup_model or backup_model == model or delay is None:
+        return await query_model(model, messages, streaming_callback, timeout, priority=priority)
+
+    response, hedged = await hedged_call(
+        lambda target, callback: query_model(target, messages, callback, timeout, priority=priority),
+        model,
+        backup_model,
+        delay,
+        streaming_callback
+    )
+    if hedged:
+        response['hedged'] = True
+    return response
+
+
+async def _query_upstream(
+    model: str,
+    prompt: str,
+    streaming_callback: Optional[Callable[[str], None]],
+    timeout: float,
+    cache_key: Optional[str],
+    priority: int,
+    conversation: Optional[Tuple[str, List[Dict[str, str]]]] = None
+) -> Dict[str, Any]:
+    """
+    Query the model, retrying transient failures within the deadline.
+
+    The model's circuit breaker is consulted first and told the final
+    outcome; only retryable failures count against it. Once any output has been streamed to the caller the call is not retried,
+    since a second attempt would stream its answer on top of the first.
+    Successful answers are stored under `cache_key` when one is given.
+    `conversation` is a (conversation_id, messages) pair for calls that use
+    the conversation's live session.
+    """
+    breaker = _breakers.get(model)
+    if not breaker.allow():
+        return _circuit_open_response(model)
+
+    streamed = [False]
+
+    def publish(delta: str) -> None:
+        streamed[0] = True
+        streaming_callback(delta)
+
     try:
-        # Create ephemeral session for this query
-        session = await _client.create_session({
-            "model": model,
-            "streaming": streaming_callback is not None
-        })
+        response = await _retry_policy.run(
+            lambda remaining: _attempt_query(
+                model, prompt, publish if streaming_callback else None, remaining, priority, conversation
+            ),
+            timeout,
+            can_retry=lambda: not streamed[0]
+        )
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    breaker.record(ok=not is_retryable(response), error=response.get('error'))
+
+    if cache_key is not None and _response_cache is not None and not response.get('error'):
+        _response_cache.put(cache_key, response['content'])
+    return response
+
+
+def _circuit_open_response(model: str) -> Dict[str, Any]:
+    """Response for a call refused by an open circuit breaker."""
+    retry_after = _breakers.get(model).retry_after()
+    return {
+        'model': model,
+        'content': None,
+        'error': f'Skipped: {model} is failing; circuit open for another {retry_after:.0f}s',
+        'error_type': ERROR_CIRCUIT_OPEN,
+        'status': 'skipped',
+        'attempts': 0
+    }
 
+
+async def _attempt_query(
+    model: str,
+    prompt: str,
+    streaming_callback: Optional[Callable[[str], None]],
+    timeout: float,
+    priority: int,
+    conversation: Optional[Tuple[str, List[Dict[str, str]]]] = None
+) -> Dict[str, Any]:
+    """
+    Make one attempt at a query under its deadline.
+
+    The attempt first waits for a slot under the model's concurrency limit;
+    that wait counts against the deadline. Never raises for model or SDK
+    failures; they come back as error dicts.
+    """
+    limiter = _limiters.get(model)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    try:
+        permit = await limiter.acquire(priority, timeout)
         try:
-            # Convert messages to prompt format
-            # The SDK expects a single prompt, so we format the conversation
+            remaining = timeout - (loop.time() - started)
+            if conversation is not None:
+                run = _run_conversation_query(model, *conversation, streaming_callback, remaining)
+            else:
+                run = _run_query(model, prompt, streaming_callback, remaining)
+            response = await asyncio.wait_for(run, timeout=remaining)
+            # Only failures worth retrying signal congestion
+            permit.record(ok=not is_retryable(response))
+        except asyncio.TimeoutError:
+            permit.record(ok=False)
+            raise
+        except Exception as e:
+            permit.record(ok=not is_retryable({'error': str(e) or type(e).__name__}))
+            raise
+        finally:
+            limiter.release(permit)
+        return response
+    except asyncio.TimeoutError:
+        # Rounded for display only; the deadline itself is used as given
+        shown = round(timeout, 1)
+        logger.warning(f"Model {model} timed out after {shown}s")
+        return {
+            'model': model,
+            'content': None,
+            'error': f'Timeout after {shown}s',
+            'error_type': ERROR_TIMEOUT,
+            'timeout': shown
+        }
+    except QueueFull as e:
+        logger.warning(f"Model {model} queue is full: {e}")
+        return {
+            'model': model,
+            'content': None,
+            'error': f'Model queue full: {e}',
+            'error_type': ERROR_OVERLOADED
+        }
+    except Exception as e:
+        logger.error(f"Error querying model {model}: {e}")
+        return {
+            'model': model,
+            'content': None,
+            'error': str(e) or type(e).__name__
+        }
+
+
+async def _run_query(
+    model: str,
+    prompt: str,
+    streaming_callback: Optional[Callable[[str], None]],
+    timeout: float
+) -> Dict[str, Any]:
+    """
+    Send one prompt on a pooled session of the least-loaded client and
+    wait for the answer.
+
+    Cancellation (including the deadline in query_model) aborts the
+    in-flight request before the session is handed back for teardown.
+    """
+    # Check out a warm session for this query
+    started = time.monotonic()
+    # Hold on to the pool: stop_client() clears _clients while calls unwind
+    pool = _clients
+    # Waits here while every client is being restarted
+    shard = await pool.acquire()
+    sessions = shard.sessions
+    try:
+        session = await sessions.acquire(model, streaming_callback is not None)
+    except BaseException:
+        pool.release(shard)
+        raise
+    aborted = False
+
+    try:
+        return await _send_prompt(session, model, prompt, streaming_callback, timeout, started)
+    except asyncio.CancelledError:
+        aborted = True
+        raise
+    finally:
+        sessions.release(session, abort=aborted)
+        pool.release(shard)
+
+
+async def _run_conversation_query(
+    model: str,
+    conversation_id: str,
+    messages: List[Dict[str, str]],
+    streaming_callback: Optional[Callable[[str], None]],
+    timeout: float
+) -> Dict[str, Any]:
+    """
+    Send the latest turn of a conversation on the session kept for it.
+
+    When the conversation's session with this model has answered every
+    earlier user turn, only the new one is sent. Otherwise a session is
+    started on the least-loaded client with the whole conversation so far.
+    A failed or cancelled turn closes the session, so a retry rebuilds it.
+    """
+    started = time.monotonic()
+    pool = _clients
+    turns = _conversation_turns(messages)
+    entry = await _conversations.acquire(conversation_id, model, turns)
+    ok = False
+    aborted = False
+    try:
+        if entry.session is not None and entry.shard.client is entry.client and pool.pin(entry.shard):
+            shard = entry.shard
+            prompt = messages[-1].get('content', '')
+        else:
+            _conversations.discard(entry)
+            shard = await pool.acquire()
+            try:
+                # Conversation sessions always stream, so one session serves
+                # both streaming and non-streaming turns
+                entry.session = await shard.sessions.acquire(model, streaming=True)
+            except BaseException:
+                pool.release(shard)
+                raise
+            entry.client = shard.client
+            entry.shard = shard
             prompt = _format_messages_to_prompt(messages)
 
-            if streaming_callback:
-                # Use event-based streaming
-                content_parts = []
-                done_event = asyncio.Event()
-                error_holder = [None]
-
-                def on_event(event):
-                    if event.type.value == "assistant.message_delta":
-                        delta = event.data.delta_content or ""
-                        content_parts.append(delta)
-                        streaming_callback(delta)
-                    elif event.type.value == "assistant.message":
-                        done_event.set()
-                    elif event.type.value == "session.idle":
-                        done_event.set()
-                    elif event.type.value == "error":
-                        error_holder[0] = getattr(event.data, 'message', str(event.data))
-                        done_event.set()
-
-                session.on(on_event)
-                await session.send({"prompt": prompt})
-
-                # Wait for completion with timeout
-                try:
-                    await asyncio.wait_for(done_event.wait(), timeout=timeout)
-                except asyncio.TimeoutError:
-                    return {
-                        'model': model,
-                        'content': None,
-                        'error': f'Timeout after {timeout}s'
-                    }
-
-                if error_holder[0]:
-                    return {
-                        'model': model,
-                        'content': None,
-                        'error': error_holder[0]
-                    }
+        try:
+            response = await _send_prompt(entry.session, model, prompt, streaming_callback, timeout, started)
+        finally:
+            pool.release(shard)
+        ok = not response.get('error')
+        if ok:
+            entry.turns = turns + 1
+        return response
+    except asyncio.CancelledError:
+        aborted = True
+        raise
+    finally:
+        _conversations.release(entry, keep=ok, abort=aborted)
+
+
+def _conversation_turns(messages: List[Dict[str, str]]) -> int:
+    """Count the user turns before the last message, including those a summary stands in for."""
+    return sum(
+        msg.get('turns', 1 if msg.get('role', 'user') == 'user' else 0)
+        for msg in messages[:-1]
+    )
+
+
+async def _send_prompt(
+    session: Any,
+    model: str,
+    prompt: str,
+    streaming_callback: Optional[Callable[[str], None]],
+    timeout: float,
+    started: float
+) -> Dict[str, Any]:
+    """
+    Send a prompt on a checked-out session and wait for the answer.
+
+    Time to first output, measured from `started`, goes into the hedging
+    latency histograms.
+    """
+    first_output = [False]
+    usage: Dict[str, float] = {}
+
+    def record_first_output() -> None:
+        if not first_output[0]:
+            first_output[0] = True
+            _latency.record(model, streaming_callback is not None, time.monotonic() - started)
+
+    unsubscribe = None
+    try:
+        if streaming_callback:
+            # Use event-based streaming
+            content_parts = []
+            done_event = asyncio.Event()
+            error_holder = [None]
+
+            def on_event(event):
+                if event.type.value == "assistant.message_delta":
+                    delta = event.data.delta_content or ""
+                    record_first_output()
+                    content_parts.append(delta)
+                    streaming_callback(delta)
+                elif event.type.value == "assistant.message":
+                    done_event.set()
+                elif event.type.value == "session.idle":
+                    done_event.set()
+                elif event.type.value in ("session.error", "error"):
+                    error_holder[0] = getattr(event.data, 'message', str(event.data))
+                    done_event.set()
+                elif event.type.value == "assistant.usage":
+                    _add_usage(usage, event.data)
 
+            unsubscribe = session.on(on_event)
+            await session.send({"prompt": prompt})
+            await done_event.wait()
+
+            if error_holder[0]:
                 return {
                     'model': model,
-                    'content': ''.join(content_parts)
+                    'content': None,
+                    'error': error_holder[0]
                 }
-            else:
-                # Use send_and_wait for non-streaming
-                response = await session.send_and_wait({"prompt": prompt})
 
-                if response is None:
-                    return {
-                        'model': model,
-                        'content': None,
-                        'error': 'No response received'
-                    }
+            return _with_usage({
+                'model': model,
+                'content': ''.join(content_parts)
+            }, usage)
+        else:
+            # Use send_and_wait for non-streaming. It applies its own 60s
+            # default otherwise, so hand it our deadline; the outer wait_for
+            # still owns cancellation.
+            def on_event(event):
+                if event.type.value == "assistant.usage":
+                    _add_usage(usage, event.data)
+
+            unsubscribe = session.on(on_event)
+            response = await session.send_and_wait({"prompt": prompt}, timeout=timeout)
 
+            if response is None:
                 return {
                     'model': model,
-                    'content': response.data.content
+                    'content': None,
+                    'error': 'No response received'
                 }
 
-        finally:
-            await session.destroy()
+            record_first_output()
+            return _with_usage({
+                'model': model,
+                'content': response.data.content
+            }, usage)
 
-    except Exception as e:
-        logger.error(f"Error querying model {model}: {e}")
-        return {
-            'model': model,
-            'content': None,
-            'error': str(e)
-        }
+    except asyncio.CancelledError:
+        # Still waiting for output: the time so far is a lower bound on the
+        # true latency. Dropping it would bias the hedging percentiles
+        # towards the calls that were fast enough to finish.
+        record_first_output()
+        raise
+
+    finally:
+        # Conversation sessions outlive this call; stop routing their
+        # events to it
+        if unsubscribe is not None:
+            unsubscribe()
+
+
+# Token and cost counters reported by "assistant.usage" events
+_USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "cost")
+
+
+def _add_usage(usage: Dict[str, float], data: Any) -> None:
+    """Accumulate one usage event into `usage`."""
+    for field in _USAGE_FIELDS:
+        value = getattr(data, field, None)
+        if value is not None:
+            usage[field] = usage.get(field, 0) + value
+
+
+def _with_usage(result: Dict[str, Any], usage: Dict[str, float]) -> Dict[str, Any]:
+    """Attach usage counters to a successful result when the model reported any."""
+    if usage:
+        result['usage'] = dict(usage)
+    return result
 
 
 async def query_models_parallel(
     models: List[str],
     messages: List[Dict[str, str]],
-    streaming_callback: Optional[Callable[[str, str], None]] = None
+    streaming_callback: Optional[Callable[[str, str], None]] = None,
+    quorum: Optional[int] = None,
+    deadline: Optional[float] = None,
+    cancel_stragglers: bool = True,
+    conversation_id: Optional[str] = None
 ) -> Dict[str, Dict[str, Any]]:
     """
     Query multiple models in parallel.
 
+    By default this waits for every model. With a quorum and/or deadline it
+    returns as soon as `quorum` models have answered successfully or
+    `deadline` seconds have passed, whichever comes first. Models still
+    running at that point are either cancelled or left to finish in the
+    background, and their entries are marked with 'status' 'cancelled' or
+    'late' respectively. Models whose circuit breaker is open are not
+    queried at all and get 'status' 'skipped'.
+
     Args:
         models: List of Copilot model identifiers
         messages: List of message dicts to send to each model
         streaming_callback: Optional callback(model, delta) for streaming
+        quorum: Number of successful responses to wait for (None = all models)
+        deadline: Seconds to wait before returning with what has arrived
+        cancel_stragglers: Cancel unfinished models (True) or let them run on
+        conversation_id: Use each model's live session for this conversation
+            (see query_model)
 
     Returns:
-        Dict mapping model identifier to response dict
+        Dict mapping model identifier to response dict, in the order of `models`
     """
     # Create per-model streaming callbacks if provided
     def make_model_callback(model: str):
@@ -210,17 +1007,70 @@ async def query_models_parallel(
             return lambda delta: streaming_callback(model, delta)
         return None
 
-    # Create tasks for all models
-    tasks = [
-        query_model(model, messages, make_model_callback(model))
-        for model in models
-    ]
+    responses: Dict[str, Dict[str, Any]] = {}
 
-    # Wait for all to complete
-    responses = await asyncio.gather(*tasks)
+    # Skip models whose circuit breaker is open rather than waiting on them
+    for model in models:
+        if _breakers.get(model).is_open():
+            responses[model] = _circuit_open_response(model)
+
+    # Create tasks for the remaining models
+    tasks = {
+        asyncio.create_task(
+            query_model(model, messages, make_model_callback(model), conversation_id=conversation_id)
+        ): model
+        for model in models if model not in responses
+    }
+
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline is not None else None
+    needed = quorum if quorum is not None else len(tasks)
+
+    successes = 0
+    pending = set(tasks)
+
+    try:
+        # Collect responses until quorum, deadline, or everyone has finished
+        while pending and successes < needed:
+            remaining = None if stop_at is None else stop_at - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                response = task.result()
+                responses[tasks[task]] = response
+                if not response.get('error'):
+                    successes += 1
+    except asyncio.CancelledError:
+        for task in pending:
+            task.cancel()
+        raise
+
+    # Deal with the stragglers
+    for task in pending:
+        model = tasks[task]
+        if cancel_stragglers:
+            task.cancel()
+            responses[model] = {
+                'model': model,
+                'content': None,
+                'error': 'Cancelled: council quorum or deadline reached first',
+                'status': 'cancelled'
+            }
+        else:
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            responses[model] = {
+                'model': model,
+                'content': None,
+                'error': 'Late: still running when council quorum or deadline was reached',
+                'status': 'late'
+            }
 
     # Map models to their responses
-    return {model: response for model, response in zip(models, responses)}
+    return {model: responses[model] for model in models}
 
 
 def _format_messages_to_prompt(messages: List[Dict[str, str]]) -> str:
@@ -1,14 +1,45 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple, Optional, Callable
-from .copilot_client import query_models_parallel, query_model
-from .config import DEFAULT_COUNCIL_MODELS, DEFAULT_CHAIRMAN_MODEL
+import asyncio
+from typing import List, Dict, Any, Tuple, Optional, Callable, AsyncIterator
+from .copilot_client import query_models_parallel, query_model, query_model_hedged
+from .concurrency import PRIORITY_HIGH, PRIORITY_LOW
+from .config import (
+    DEFAULT_COUNCIL_MODELS,
+    DEFAULT_CHAIRMAN_MODEL,
+    STAGE1_QUORUM,
+    STAGE1_DEADLINE,
+    STAGE1_CANCEL_STRAGGLERS,
+    STAGE2_QUORUM,
+    STAGE2_PROMPT_MAX_TOKENS,
+    STAGE3_PROMPT_MAX_TOKENS,
+    CHAIRMAN_CONTEXT,
+    CRITIQUE_DIGEST_WORDS,
+    STREAM_COALESCE_INTERVAL,
+    STREAM_COALESCE_CHARS,
+)
+from .context import review_context
+from .prompt_budget import fit_sections, prompt_budget
+from .streaming import DeltaCoalescer, wait_with_frames
+from .tokens import estimate_tokens
+
+# Relative share of the Stage 3 budget for a peer ranking, against 1.0-2.0
+# for a Stage 1 response depending on how well it was ranked
+RANKING_SECTION_WEIGHT = 0.5
+
+# Relative share of the Stage 2 and Stage 3 budgets for the conversation
+# context of a follow-up question, against 1.0 for a Stage 1 response
+CONTEXT_SECTION_WEIGHT = 0.5
 
 
 async def stage1_collect_responses(
     user_query: str,
     council_models: Optional[List[str]] = None,
-    streaming_callback: Optional[Callable[[str, str], None]] = None
+    streaming_callback: Optional[Callable[[str, str], None]] = None,
+    quorum: Optional[int] = STAGE1_QUORUM,
+    deadline: Optional[float] = STAGE1_DEADLINE,
+    conversation_id: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Stage 1: Collect individual responses from all council models.
@@ -17,28 +48,33 @@ async def stage1_collect_responses(
         user_query: The user's question
         council_models: List of model IDs to query (defaults to settings/config)
         streaming_callback: Optional callback(model, delta) for streaming
+        quorum: Return once this many models have answered (None = all)
+        deadline: Return after this many seconds with whatever has arrived
+        conversation_id: Conversation the query belongs to; each model keeps a
+            live session for it so only the new turn is sent
+        history: Earlier turns of the conversation, from context.build_context()
 
     Returns:
-        List of dicts with 'model', 'response', and optional 'error' keys
+        List of dicts with 'model', 'response', and optional 'error' keys.
+        Models that missed the quorum/deadline also carry a 'status' of
+        'late' or 'cancelled'.
     """
     models = council_models or DEFAULT_COUNCIL_MODELS
-    messages = [{"role": "user", "content": user_query}]
+    messages = (history or []) + [{"role": "user", "content": user_query}]
 
     # Query all models in parallel
-    responses = await query_models_parallel(models, messages, streaming_callback)
+    responses = await query_models_parallel(
+        models,
+        messages,
+        streaming_callback,
+        quorum=quorum,
+        deadline=deadline,
+        cancel_stragglers=STAGE1_CANCEL_STRAGGLERS,
+        conversation_id=conversation_id
+    )
 
     # Format results, including errors for failed models
-    stage1_results = []
-    for model, response in responses.items():
-        result = {"model": model}
-        if response.get('error'):
-            result["error"] = response['error']
-            result["response"] = None
-        else:
-            result["response"] = response.get('content', '')
-        stage1_results.append(result)
-
-    return stage1_results
+    return [_format_stage1_result(model, response) for model, response in responses.items()]
 
 
 async def stage2_collect_rankings(
@@ -60,57 +96,15 @@ async def stage2_collect_rankings(
     models = council_models or DEFAULT_COUNCIL_MODELS
 
     # Filter to only successful responses for ranking
-    successful_results = [r for r in stage1_results if r.get('response') and not r.get('error')]
+    successful_results = _successful_stage1(stage1_results)
 
     if len(successful_results) < 2:
         # Not enough responses to rank
         return [], {}
 
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(successful_results))]  # A, B, C, ...
-
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, successful_results)
-    }
-
-    # Build the ranking prompt
-    responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, successful_results)
-    ])
-
-    ranking_prompt = f"""You are evaluating different responses to the following question:
-
-Question: {user_query}
-
-Here are the responses from different models (anonymized):
-
-{responses_text}
-
-Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
-2. Then, at the very end of your response, provide a final ranking.
-
-IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
-- Start with the line "FINAL RANKING:" (all caps, with colon)
-- Then list the responses from best to worst as a numbered list
-- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
-- Do not add any other text or explanations in the ranking section
-
-Example of the correct format for your ENTIRE response:
-
-Response A provides good detail on X but misses Y...
-Response B is accurate but lacks depth on Z...
-Response C offers the most comprehensive answer...
-
-FINAL RANKING:
-1. Response C
-2. Response A
-3. Response B
-
-Now provide your evaluation and ranking:"""
+    ranking_prompt, label_to_model, _ = _build_ranking_prompt(
+        user_query, successful_results, prompt_budget(models, STAGE2_PROMPT_MAX_TOKENS)
+    )
 
     messages = [{"role": "user", "content": ranking_prompt}]
 
@@ -118,19 +112,7 @@ Now provide your evaluation and ranking:"""
     responses = await query_models_parallel(models, messages)
 
     # Format results, including errors
-    stage2_results = []
-    for model, response in responses.items():
-        result = {"model": model}
-        if response.get('error'):
-            result["error"] = response['error']
-            result["ranking"] = None
-            result["parsed_ranking"] = []
-        else:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            result["ranking"] = full_text
-            result["parsed_ranking"] = parsed
-        stage2_results.append(result)
+    stage2_results = [_format_stage2_result(model, response) for model, response in responses.items()]
 
     return stage2_results, label_to_model
 
@@ -139,7 +121,10 @@ async def stage3_synthesize_final(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     stage2_results: List[Dict[str, Any]],
-    chairman_model: Optional[str] = None
+    chairman_model: Optional[str] = None,
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None,
+    label_to_model: Optional[Dict[str, str]] = None
 ) -> Dict[str, Any]:
     """
     Stage 3: Chairman synthesizes final response.
@@ -149,36 +134,94 @@ async def stage3_synthesize_final(
         stage1_results: Individual model responses from Stage 1
         stage2_results: Rankings from Stage 2
         chairman_model: Model to use as chairman
+        streaming_callback: Optional callback(delta) for the chairman's tokens
+        aggregate_rankings: Output of calculate_aggregate_rankings; better
+            ranked responses are trimmed least if the prompt is over budget
+        label_to_model: Mapping from anonymous labels to model names, used
+            when CHAIRMAN_CONTEXT is "compact"
 
     Returns:
         Dict with 'model', 'response', and optional 'error' keys
     """
     chairman = chairman_model or DEFAULT_CHAIRMAN_MODEL
+    chairman_prompt, _ = _build_chairman_prompt(
+        user_query, stage1_results, stage2_results,
+        prompt_budget([chairman], STAGE3_PROMPT_MAX_TOKENS), aggregate_rankings, label_to_model
+    )
+    return await _ask_chairman(chairman, chairman_prompt, streaming_callback)
 
+
+def _build_chairman_prompt(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    budget: int,
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None,
+    label_to_model: Optional[Dict[str, str]] = None,
+    mode: str = CHAIRMAN_CONTEXT,
+    context: str = ""
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Build the Stage 3 chairman prompt within a token budget.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Individual model responses from Stage 1
+        stage2_results: Rankings from Stage 2
+        budget: Token budget for the whole prompt
+        aggregate_rankings: Output of calculate_aggregate_rankings
+        label_to_model: Mapping from anonymous labels to model names
+        mode: "full" to include every judge's ranking text, "compact" for the
+            aggregate ranking, parsed rankings and critique digests instead
+        context: Earlier conversation for a follow-up question, from
+            context.review_context()
+
+    Returns:
+        Tuple of (chairman prompt, list of the responses, rankings and
+        context that were excerpted to fit, with their original and kept
+        token counts)
+    """
     # Filter to successful responses for synthesis
-    successful_stage1 = [r for r in stage1_results if r.get('response') and not r.get('error')]
+    successful_stage1 = _successful_stage1(stage1_results)
     successful_stage2 = [r for r in stage2_results if r.get('ranking') and not r.get('error')]
-
-    # Build comprehensive context for chairman
-    stage1_text = "\n\n".join([
-        f"Model: {result['model']}\nResponse: {result['response']}"
+    # The compact review is small enough to go in whole
+    review_text = None
+    if mode == "compact":
+        review_text = _compact_review(successful_stage2, aggregate_rankings or [], label_to_model or {})
+        successful_stage2 = []
+
+    # Better-ranked responses keep more of their text when cuts are needed
+    positions = {entry['model']: i for i, entry in enumerate(aggregate_rankings or [])}
+    ranked = len(positions)
+    weights = [
+        1.0 + (ranked - positions[result['model']]) / ranked if result['model'] in positions else 1.0
         for result in successful_stage1
-    ])
+    ] + [RANKING_SECTION_WEIGHT] * len(successful_stage2) + [CONTEXT_SECTION_WEIGHT]
 
-    stage2_text = "\n\n".join([
-        f"Model: {result['model']}\nRanking: {result['ranking']}"
-        for result in successful_stage2
-    ])
+    def render(responses: List[str], rankings: List[str], context_text: str) -> str:
+        # Build comprehensive context for chairman
+        stage1_text = "\n\n".join([
+            f"Model: {result['model']}\nResponse: {response}"
+            for result, response in zip(successful_stage1, responses)
+        ])
 
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+        if review_text is not None:
+            stage2_section = f"STAGE 2 - Peer Review Digest:\n{review_text}"
+        else:
+            stage2_text = "\n\n".join([
+                f"Model: {result['model']}\nRanking: {ranking}"
+                for result, ranking in zip(successful_stage2, rankings)
+            ])
+            stage2_section = f"STAGE 2 - Peer Rankings:\n{stage2_text}"
 
-Original Question: {user_query}
+        return f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+
+{_context_section(context_text)}Original Question: {user_query}
 
 STAGE 1 - Individual Responses:
 {stage1_text}
 
-STAGE 2 - Peer Rankings:
-{stage2_text}
+{stage2_section}
 
 Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
 - The individual responses and their insights
@@ -187,10 +230,124 @@ Your task as Chairman is to synthesize all of this information into a single, co
 
 Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
 
+    sections = [r['response'] for r in successful_stage1] + [r['ranking'] for r in successful_stage2] + [context]
+    # Everything but the sections themselves: instructions, question, headers
+    # (a placeholder context keeps the context framing in the count)
+    overhead = estimate_tokens(render(
+        [""] * len(successful_stage1), [""] * len(successful_stage2), " " if context else ""
+    ))
+    fitted, cuts = fit_sections(sections, budget - overhead, weights)
+
+    truncated = [
+        {
+            "model": result['model'],
+            "section": "response" if i < len(successful_stage1) else "ranking",
+            "tokens": cut[0],
+            "kept": cut[1],
+        }
+        for i, (result, cut) in enumerate(zip(successful_stage1 + successful_stage2, cuts))
+        if cut is not None
+    ]
+    if cuts[-1] is not None:
+        truncated.append({"section": "context", "tokens": cuts[-1][0], "kept": cuts[-1][1]})
+    split = len(successful_stage1)
+    return render(fitted[:split], fitted[split:-1], fitted[-1]), truncated
+
+
+def _compact_review(
+    stage2_results: List[Dict[str, Any]],
+    aggregate_rankings: List[Dict[str, Any]],
+    label_to_model: Dict[str, str]
+) -> str:
+    """
+    Summarize Stage 2 for the chairman: the aggregate ranking, each judge's
+    parsed ranking, and a digest of what each judge said about each answer.
+    Anonymous labels are replaced by model names.
+    """
+    def name(label: str) -> str:
+        return label_to_model.get(label, label)
+
+    lines = ["Aggregate ranking (average position across judges, best first):"]
+    for position, entry in enumerate(aggregate_rankings, start=1):
+        lines.append(
+            f"{position}. {entry['model']} (average {entry['average_rank']} "
+            f"from {entry['rankings_count']} judges)"
+        )
+
+    lines.append("")
+    lines.append("Each judge's ranking, best first:")
+    for result in stage2_results:
+        ranking = result.get('parsed_ranking') or parse_ranking_from_text(result['ranking'])
+        lines.append(f"- {result['model']}: {' > '.join(name(label) for label in ranking) or '(not parsable)'}")
+
+    lines.append("")
+    lines.append("Critique digests:")
+    for result in stage2_results:
+        for label, digest in critique_digests(result['ranking'], CRITIQUE_DIGEST_WORDS).items():
+            lines.append(f"- {result['model']} on {name(label)}: {digest}")
+
+    return "\n".join(lines)
+
+
+def critique_digests(ranking_text: str, max_words: int) -> Dict[str, str]:
+    """
+    Extract a short digest of a judge's critique of each response.
+
+    The evaluation before FINAL RANKING is split into blocks, one per
+    response: a block starts at a line that opens by naming a response
+    ("Response B ...", "**Response B:**", "### Response B") and runs until
+    the next one. Each digest is the start of its block, cut to at most
+    `max_words` words, preferably at a sentence end.
+
+    Args:
+        ranking_text: The judge's full Stage 2 text
+        max_words: Word limit per digest
+
+    Returns:
+        Dict mapping response label to digest, in order of appearance
+    """
+    import re
+
+    evaluation = ranking_text.split("FINAL RANKING:")[0]
+    blocks: Dict[str, List[str]] = {}
+    current = None
+    for line in evaluation.splitlines():
+        text = re.sub(r'[*_#>`]+', '', line).strip().lstrip('-• ').strip()
+        if not text:
+            continue
+        opening = re.match(r'(?:\d+\.\s*)?(Response [A-Z])\b', text)
+        if opening:
+            current = opening.group(1)
+            # Drop the label when it is a heading, keep it when it starts a sentence
+            heading = re.match(r'\s*(?:[:.)\-–—]+\s*|$)', text[opening.end():])
+            if heading:
+                text = text[opening.end() + heading.end():]
+        if current and text:
+            blocks.setdefault(current, []).append(text)
+
+    digests = {}
+    for label, block in blocks.items():
+        words = " ".join(block).split()
+        digest = " ".join(words[:max_words])
+        if len(words) > max_words:
+            # Prefer ending on a full sentence if that keeps most of it
+            end = max(digest.rfind(". "), digest.rfind("! "), digest.rfind("? "))
+            digest = digest[:end + 1] if end > len(digest) // 2 else digest + " …"
+        digests[label] = digest
+    return digests
+
+
+async def _ask_chairman(
+    chairman: str,
+    chairman_prompt: str,
+    streaming_callback: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """Send the chairman prompt and format the Stage 3 result."""
     messages = [{"role": "user", "content": chairman_prompt}]
 
     # Query the chairman model
-    response = await query_model(chairman, messages)
+    # The user is waiting on this one, so it jumps any queue for the model
+    response = await query_model_hedged(chairman, messages, streaming_callback, priority=PRIORITY_HIGH)
 
     if response.get('error'):
         return {
@@ -199,12 +356,145 @@ Provide a clear, well-reasoned final answer that represents the council's collec
             "error": response['error']
         }
 
+    # A hedged call may have been answered by the backup model
     return {
-        "model": chairman,
+        "model": response.get('model', chairman),
         "response": response.get('content', '')
     }
 
 
+def _format_stage1_result(model: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a query_model response into a Stage 1 result entry."""
+    result = {"model": model}
+    if response.get('status'):
+        result["status"] = response['status']
+    if response.get('attempts', 0) > 1:
+        result["attempts"] = response['attempts']
+    if response.get('error'):
+        result["error"] = response['error']
+        result["response"] = None
+    else:
+        result["response"] = response.get('content', '')
+    return result
+
+
+def _successful_stage1(stage1_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filter Stage 1 results down to the models that answered."""
+    return [r for r in stage1_results if r.get('response') and not r.get('error')]
+
+
+def _build_ranking_prompt(
+    user_query: str,
+    successful_results: List[Dict[str, Any]],
+    budget: Optional[int] = None,
+    context: str = ""
+) -> Tuple[str, Dict[str, str], List[Dict[str, Any]]]:
+    """
+    Build the anonymized Stage 2 ranking prompt.
+
+    Args:
+        user_query: The original user query
+        successful_results: Stage 1 results that have a response
+        budget: Token budget for the prompt; responses are excerpted evenly
+            to fit (None = no limit)
+        context: Earlier conversation for a follow-up question, from
+            context.review_context()
+
+    Returns:
+        Tuple of (ranking prompt, label_to_model mapping, list of the
+        responses and context that were excerpted, with their original
+        and kept token counts)
+    """
+    # Create anonymized labels for responses (Response A, Response B, etc.)
+    labels = [chr(65 + i) for i in range(len(successful_results))]  # A, B, C, ...
+
+    # Create mapping from label to model name
+    label_to_model = {
+        f"Response {label}": result['model']
+        for label, result in zip(labels, successful_results)
+    }
+
+    def render(responses: List[str], context_text: str) -> str:
+        # Build the ranking prompt
+        responses_text = "\n\n".join([
+            f"Response {label}:\n{response}"
+            for label, response in zip(labels, responses)
+        ])
+
+        return f"""You are evaluating different responses to the following question:
+
+{_context_section(context_text)}Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}
+
+Your task:
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+2. Then, at the very end of your response, provide a final ranking.
+
+IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
+- Start with the line "FINAL RANKING:" (all caps, with colon)
+- Then list the responses from best to worst as a numbered list
+- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
+- Do not add any other text or explanations in the ranking section
+
+Example of the correct format for your ENTIRE response:
+
+Response A provides good detail on X but misses Y...
+Response B is accurate but lacks depth on Z...
+Response C offers the most comprehensive answer...
+
+FINAL RANKING:
+1. Response C
+2. Response A
+3. Response B
+
+Now provide your evaluation and ranking:"""
+
+    sections = [result['response'] for result in successful_results] + [context]
+    cuts = [None] * len(sections)
+    if budget is not None:
+        # Equal weights: no answer gets more room than another in front of the judges
+        weights = [1.0] * len(successful_results) + [CONTEXT_SECTION_WEIGHT]
+        overhead = estimate_tokens(render([""] * len(successful_results), " " if context else ""))
+        sections, cuts = fit_sections(sections, budget - overhead, weights)
+
+    truncated = [
+        {"label": f"Response {label}", "model": result['model'], "tokens": cut[0], "kept": cut[1]}
+        for label, result, cut in zip(labels, successful_results, cuts)
+        if cut is not None
+    ]
+    if cuts[-1] is not None:
+        truncated.append({"section": "context", "tokens": cuts[-1][0], "kept": cuts[-1][1]})
+    return render(sections[:-1], sections[-1]), label_to_model, truncated
+
+
+def _context_section(context_text: str) -> str:
+    """Frame the earlier conversation of a follow-up question for a Stage 2 or Stage 3 prompt."""
+    if not context_text:
+        return ""
+    return f"The question is a follow-up in an ongoing conversation. The conversation so far:\n{context_text}\n\n"
+
+
+def _format_stage2_result(model: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a query_model response into a Stage 2 result entry."""
+    result = {"model": model}
+    if response.get('status'):
+        result["status"] = response['status']
+    if response.get('attempts', 0) > 1:
+        result["attempts"] = response['attempts']
+    if response.get('error'):
+        result["error"] = response['error']
+        result["ranking"] = None
+        result["parsed_ranking"] = []
+    else:
+        full_text = response.get('content', '')
+        result["ranking"] = full_text
+        result["parsed_ranking"] = parse_ranking_from_text(full_text)
+    return result
+
+
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
     """
     Parse the FINAL RANKING section from the model's response.
@@ -260,6 +550,9 @@ def calculate_aggregate_rankings(
 
     for ranking in stage2_results:
         ranking_text = ranking['ranking']
+        if not ranking_text:
+            # Failed or cancelled judge
+            continue
 
         # Parse the ranking from the structured format
         parsed_ranking = parse_ranking_from_text(ranking_text)
@@ -308,7 +601,7 @@ Title:"""
 
     messages = [{"role": "user", "content": title_prompt}]
 
-    response = await query_model(model, messages)
+    response = await query_model_hedged(model, messages, priority=PRIORITY_LOW)
 
     if response.get('error') or not response.get('content'):
         # Fallback to a generic title
@@ -326,55 +619,272 @@ Title:"""
     return title
 
 
-async def run_full_council(
+async def run_council_pipeline(
     user_query: str,
     council_models: Optional[List[str]] = None,
-    chairman_model: Optional[str] = None
-) -> Tuple[List, List, Dict, Dict]:
+    chairman_model: Optional[str] = None,
+    stage1_quorum: Optional[int] = STAGE1_QUORUM,
+    stage1_deadline: Optional[float] = STAGE1_DEADLINE,
+    stage2_quorum: Optional[int] = STAGE2_QUORUM,
+    stream_deltas: bool = False,
+    conversation_id: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the complete 3-stage council process.
+    Run the 3-stage council as an overlapping pipeline.
+
+    Stage 2 judges start as soon as the Stage 1 quorum is met (or the Stage 1
+    deadline passes), while Stage 1 stragglers keep running. The chairman
+    starts as soon as `stage2_quorum` judges have returned a parsable ranking.
+    Stage 1 stragglers that finish before the chairman starts are passed to
+    the chairman unranked with status 'late'; anything still running at that
+    point is cancelled. With the default quorums of None every stage waits
+    for all models, which matches the sequential behaviour.
 
     Args:
         user_query: The user's question
         council_models: List of model IDs for the council
         chairman_model: Model ID for the chairman
-
-    Returns:
-        Tuple of (stage1_results, stage2_results, stage3_result, metadata)
+        stage1_quorum: Successful Stage 1 responses needed to start Stage 2
+        stage1_deadline: Seconds after which Stage 2 starts with what has arrived
+        stage2_quorum: Parsed rankings needed to start the chairman
+        stream_deltas: Also yield 'stage1_delta' and 'stage3_delta' events with
+            model tokens as they arrive, coalesced per STREAM_COALESCE_* settings
+        conversation_id: Conversation the query belongs to; Stage 1 models
+            keep a live session for it so only the new turn is sent
+        history: Earlier turns of the conversation, from context.build_context()
+
+    Yields:
+        Event dicts in the SSE wire format: 'stage1_start', 'stage1_delta'
+        (when streaming), 'stage1_complete' (re-sent when late Stage 1
+        responses arrive), 'stage2_start', 'stage2_complete' (with
+        'metadata'), 'stage3_start', 'stage3_delta' (when streaming),
+        'stage3_complete' (with the final 'metadata'). The metadata's
+        'truncated' lists, per stage, the responses and rankings that were
+        excerpted to fit the STAGE2/STAGE3_PROMPT_MAX_TOKENS budgets.
     """
     models = council_models or DEFAULT_COUNCIL_MODELS
     chairman = chairman_model or DEFAULT_CHAIRMAN_MODEL
+    messages = (history or []) + [{"role": "user", "content": user_query}]
+    # Judges and chairman see the summary and the last exchange, not every turn
+    context = review_context(history)
+    loop = asyncio.get_running_loop()
+
+    stage1_needed = min(stage1_quorum or len(models), len(models))
+    stage1_stop_at = loop.time() + stage1_deadline if stage1_deadline is not None else None
+
+    stage1_tasks: Dict[asyncio.Task, str] = {}
+    stage2_tasks: Dict[asyncio.Task, str] = {}
+    stage1_responses: Dict[str, Dict[str, Any]] = {}
+    stage2_responses: Dict[str, Dict[str, Any]] = {}
+
+    def stage1_snapshot() -> List[Dict[str, Any]]:
+        return [
+            _format_stage1_result(model, stage1_responses[model])
+            for model in models if model in stage1_responses
+        ]
+
+    def stage1_successes() -> int:
+        return sum(1 for r in stage1_responses.values() if not r.get('error'))
+
+    coalescer = None
+    if stream_deltas:
+        coalescer = DeltaCoalescer('stage1_delta', STREAM_COALESCE_INTERVAL, STREAM_COALESCE_CHARS)
+
+    def stage1_callback(model: str) -> Optional[Callable[[str], None]]:
+        return coalescer.callback(model) if coalescer else None
+
+    def stage1_done(task: asyncio.Task) -> None:
+        if coalescer:
+            # Deltas for a finished model go out before its result does
+            coalescer.flush(stage1_tasks[task])
+
+    yield {'type': 'stage1_start'}
+
+    for model in models:
+        stage1_tasks[asyncio.create_task(
+            query_model(model, messages, stage1_callback(model), conversation_id=conversation_id)
+        )] = model
+    pending = set(stage1_tasks)
+
+    try:
+        # Stage 1: wait for the quorum, the deadline, or every model
+        while pending and stage1_successes() < stage1_needed:
+            if stage1_stop_at is not None:
+                remaining = stage1_stop_at - loop.time()
+                if remaining <= 0 and stage1_successes() > 0:
+                    break
+                timeout = max(remaining, 0) if stage1_successes() > 0 else None
+            else:
+                timeout = None
+            done, pending, frames = await wait_with_frames(pending, coalescer, timeout)
+            for task in done:
+                stage1_done(task)
+                stage1_responses[stage1_tasks[task]] = task.result()
+            if done and coalescer:
+                frames.extend(coalescer.drain())
+            for frame in frames:
+                yield frame
+
+        stage1_results = stage1_snapshot()
+        yield {'type': 'stage1_complete', 'data': stage1_results}
+
+        successful = _successful_stage1(stage1_results)
+        if not successful:
+            yield {
+                'type': 'stage3_complete',
+                'data': {
+                    "model": chairman,
+                    "response": None,
+                    "error": "All models failed to respond. Please try again."
+                },
+                'metadata': {"errors": [r.get('error') for r in stage1_results if r.get('error')]}
+            }
+            return
+
+        # Stage 2: start judges on the responses we have, keep Stage 1 stragglers running
+        yield {'type': 'stage2_start'}
+
+        label_to_model: Dict[str, str] = {}
+        truncated: Dict[str, List[Dict[str, Any]]] = {'stage2': [], 'stage3': []}
+        if len(successful) >= 2:
+            ranking_prompt, label_to_model, truncated['stage2'] = _build_ranking_prompt(
+                user_query, successful, prompt_budget(models, STAGE2_PROMPT_MAX_TOKENS), context
+            )
+            ranking_messages = [{"role": "user", "content": ranking_prompt}]
+            for model in models:
+                stage2_tasks[asyncio.create_task(query_model(model, ranking_messages))] = model
+            pending |= set(stage2_tasks)
+
+        stage2_needed = min(stage2_quorum or len(stage2_tasks), len(stage2_tasks))
+
+        def stage2_parsed() -> int:
+            return sum(
+                1 for r in stage2_responses.values()
+                if not r.get('error') and parse_ranking_from_text(r.get('content') or '')
+            )
+
+        while pending & set(stage2_tasks) and stage2_parsed() < stage2_needed:
+            done, pending, frames = await wait_with_frames(pending, coalescer)
+            late_arrivals = False
+            for task in done:
+                if task in stage2_tasks:
+                    stage2_responses[stage2_tasks[task]] = task.result()
+                else:
+                    stage1_done(task)
+                    response = task.result()
+                    if not response.get('error'):
+                        response = {**response, 'status': 'late'}
+                    stage1_responses[stage1_tasks[task]] = response
+                    late_arrivals = True
+            if late_arrivals and coalescer:
+                frames.extend(coalescer.drain())
+            for frame in frames:
+                yield frame
+            if late_arrivals:
+                yield {'type': 'stage1_complete', 'data': stage1_snapshot()}
+
+        # Cancel whatever is still running before the chairman starts
+        for task in pending:
+            task.cancel()
+            if task in stage2_tasks:
+                stage2_responses[stage2_tasks[task]] = {
+                    'model': stage2_tasks[task],
+                    'content': None,
+                    'error': 'Cancelled: ranking quorum reached first',
+                    'status': 'cancelled'
+                }
+            else:
+                stage1_responses[stage1_tasks[task]] = {
+                    'model': stage1_tasks[task],
+                    'content': None,
+                    'error': 'Cancelled: council quorum or deadline reached first',
+                    'status': 'cancelled'
+                }
+        if pending & set(stage1_tasks):
+            yield {'type': 'stage1_complete', 'data': stage1_snapshot()}
+        pending = set()
+
+        stage1_results = stage1_snapshot()
+        stage2_results = [
+            _format_stage2_result(model, stage2_responses[model])
+            for model in models if model in stage2_responses
+        ]
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+        metadata = {
+            'label_to_model': label_to_model,
+            'aggregate_rankings': aggregate_rankings,
+            'truncated': truncated,
+            'chairman_context': CHAIRMAN_CONTEXT,
+        }
+        yield {'type': 'stage2_complete', 'data': stage2_results, 'metadata': metadata}
+
+        # Stage 3: Synthesize final answer
+        yield {'type': 'stage3_start'}
+        chairman_prompt, truncated['stage3'] = _build_chairman_prompt(
+            user_query, stage1_results, stage2_results,
+            prompt_budget([chairman], STAGE3_PROMPT_MAX_TOKENS), aggregate_rankings, label_to_model,
+            context=context
+        )
+        if coalescer is None:
+            stage3_result = await _ask_chairman(chairman, chairman_prompt)
+        else:
+            coalescer.close()
+            coalescer = DeltaCoalescer('stage3_delta', STREAM_COALESCE_INTERVAL, STREAM_COALESCE_CHARS)
+            chairman_task = asyncio.create_task(
+                _ask_chairman(chairman, chairman_prompt, coalescer.callback(chairman))
+            )
+            pending = {chairman_task}
+            while pending:
+                done, pending, frames = await wait_with_frames(pending, coalescer)
+                if done:
+                    coalescer.flush_all()
+                    frames.extend(coalescer.drain())
+                for frame in frames:
+                    yield frame
+            stage3_result = chairman_task.result()
+        yield {'type': 'stage3_complete', 'data': stage3_result, 'metadata': metadata}
+
+    finally:
+        for task in pending:
+            task.cancel()
+        if coalescer:
+            coalescer.close()
 
-    # Stage 1: Collect individual responses
-    stage1_results = await stage1_collect_responses(user_query, models)
-
-    # Check if we have any successful responses
-    successful_responses = [r for r in stage1_results if r.get('response') and not r.get('error')]
-    if not successful_responses:
-        return stage1_results, [], {
-            "model": chairman,
-            "response": None,
-            "error": "All models failed to respond. Please try again."
-        }, {"errors": [r.get('error') for r in stage1_results if r.get('error')]}
-
-    # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results, models)
 
-    # Calculate aggregate rankings
-    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+async def run_full_council(
+    user_query: str,
+    council_models: Optional[List[str]] = None,
+    chairman_model: Optional[str] = None,
+    conversation_id: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None
+) -> Tuple[List, List, Dict, Dict]:
+    """
+    Run the complete 3-stage council process.
 
-    # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results,
-        chairman
-    )
+    Args:
+        user_query: The user's question
+        council_models: List of model IDs for the council
+        chairman_model: Model ID for the chairman
+        conversation_id: Conversation the query belongs to
+        history: Earlier turns of the conversation, from context.build_context()
 
-    # Prepare metadata
-    metadata = {
-        "label_to_model": label_to_model,
-        "aggregate_rankings": aggregate_rankings
-    }
+    Returns:
+        Tuple of (stage1_results, stage2_results, stage3_result, metadata)
+    """
+    stage1_results, stage2_results, stage3_result, metadata = [], [], {}, {}
+
+    async for event in run_council_pipeline(
+        user_query, council_models, chairman_model,
+        conversation_id=conversation_id, history=history
+    ):
+        if event['type'] == 'stage1_complete':
+            stage1_results = event['data']
+        elif event['type'] == 'stage2_complete':
+            stage2_results = event['data']
+            metadata = event['metadata']
+        elif event['type'] == 'stage3_complete':
+            stage3_result = event['data']
+            metadata = event.get('metadata', metadata)
 
     return stage1_results, stage2_results, stage3_result, metadata
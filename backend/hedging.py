@@ -0,0 +1,156 @@
+"""Hedged model requests: fire a backup when the primary is slow to start."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DeltaCallback = Callable[[str], None]
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples for one model."""
+
+    def __init__(self, window: int):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class LatencyTracker:
+    """
+    Time to first output per (model, streaming) pair.
+
+    For streaming calls that is the time to the first delta; for
+    non-streaming calls the time to the complete answer, since that is when
+    the first output appears.
+    """
+
+    def __init__(self, window: int, min_samples: int):
+        self._window = window
+        self._min_samples = min_samples
+        self._histograms: Dict[Tuple[str, bool], LatencyHistogram] = {}
+
+    def record(self, model: str, streaming: bool, seconds: float) -> None:
+        """Record one successful call's time to first output."""
+        key = (model, streaming)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram(self._window)
+        histogram.record(seconds)
+
+    def threshold(self, model: str, streaming: bool, percentile: float) -> Optional[float]:
+        """
+        Return the given percentile of time to first output, or None until
+        enough samples have been seen to trust it.
+        """
+        histogram = self._histograms.get((model, streaming))
+        if histogram is None or len(histogram) < self._min_samples:
+            return None
+        return histogram.percentile(percentile)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return sample counts and p50/p95/p99 per model and mode."""
+        return {
+            f"{model}{' (streaming)' if streaming else ''}": {
+                "samples": len(histogram),
+                "p50": round(histogram.percentile(0.5), 3),
+                "p95": round(histogram.percentile(0.95), 3),
+                "p99": round(histogram.percentile(0.99), 3),
+            }
+            for (model, streaming), histogram in self._histograms.items()
+            if len(histogram)
+        }
+
+
+async def hedged_call(
+    start: Callable[[str, Optional[DeltaCallback]], Awaitable[Dict[str, Any]]],
+    primary: str,
+    backup: str,
+    delay: float,
+    streaming_callback: Optional[DeltaCallback] = None
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Run `start(primary, callback)` and, if it has produced no output after
+    `delay` seconds (or failed before then), also `start(backup, callback)`.
+
+    When streaming, the first model to emit a delta wins and only its deltas
+    reach `streaming_callback`. Without streaming, the first successful answer
+    wins. The loser is cancelled either way.
+
+    Args:
+        start: Starts a call for a model with an optional delta callback
+        primary: Model to try first
+        backup: Model to hedge with
+        delay: Seconds to give the primary before hedging
+        streaming_callback: Optional callback(delta) for the winner's output
+
+    Returns:
+        Tuple of (winning or last response, whether the backup was fired)
+    """
+    winner: Dict[str, Optional[str]] = {"model": None}
+    decided = asyncio.Event()
+
+    def callback_for(model: str) -> Optional[DeltaCallback]:
+        if streaming_callback is None:
+            return None
+
+        def on_delta(delta: str) -> None:
+            if winner["model"] is None:
+                winner["model"] = model
+                decided.set()
+            if winner["model"] == model:
+                streaming_callback(delta)
+        return on_delta
+
+    tasks = {asyncio.create_task(start(primary, callback_for(primary))): primary}
+    decided_waiter = asyncio.create_task(decided.wait())
+    hedged = False
+    last_response: Optional[Dict[str, Any]] = None
+
+    try:
+        timeout: Optional[float] = delay
+        while tasks:
+            done, _ = await asyncio.wait(
+                set(tasks) | {decided_waiter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if decided.is_set():
+                # A model started streaming; commit to it
+                task = next(t for t, m in tasks.items() if m == winner["model"])
+                for other in tasks:
+                    if other is not task:
+                        other.cancel()
+                return await task, hedged
+
+            for task in done - {decided_waiter}:
+                model = tasks.pop(task)
+                last_response = task.result()
+                if not last_response.get('error'):
+                    for other in tasks:
+                        other.cancel()
+                    return last_response, hedged
+                logger.info(f"Hedged call to {model} failed: {last_response['error']}")
+
+            if not hedged and (not done or not tasks):
+                # Primary is slow, or failed before its deadline - try the backup too
+                hedged = True
+                timeout = None
+                logger.info(f"Hedging {primary} with {backup}")
+                tasks[asyncio.create_task(start(backup, callback_for(backup)))] = backup
+
+        return last_response, hedged
+    finally:
+        decided_waiter.cancel()
+        for task in tasks:
+            task.cancel()
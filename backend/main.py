@@ -1,7 +1,7 @@
 """FastAPI backend for LLM Council."""
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -11,25 +11,49 @@ import json
 import asyncio
 import logging
 
-from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
-from .copilot_client import start_client, stop_client, get_available_models
+from . import async_storage as storage
+from .config import LOOP_LAG_INTERVAL
+from .metrics import LoopLagMonitor
+from .council import run_full_council, run_council_pipeline, generate_conversation_title
+from .context import build_context, schedule_summary_update
+from .copilot_client import (
+    start_client,
+    stop_client,
+    get_available_models,
+    get_model_health,
+    get_pool_stats,
+    get_cache_stats,
+    get_coalescing_stats,
+    get_concurrency_stats,
+    get_retry_stats,
+    get_latency_stats,
+    get_catalog_stats,
+    get_conversation_session_stats,
+    get_startup_status,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+loop_lag = LoopLagMonitor(LOOP_LAG_INTERVAL)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage Copilot client lifecycle."""
-    logger.info("Starting Copilot client...")
+    """Manage Copilot client and storage lifecycle."""
+    storage.start()
+    loop_lag.start()
+    # Warm up in the background so the port is bound straight away;
+    # /health/ready reports when model calls can be served
+    logger.info("Starting Copilot client in the background...")
     await start_client()
-    logger.info("Copilot client started successfully")
     yield
     logger.info("Stopping Copilot client...")
     await stop_client()
     logger.info("Copilot client stopped")
+    await loop_lag.stop()
+    storage.shutdown()
 
 
 app = FastAPI(title="LLM Council API", lifespan=lifespan)
@@ -41,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -82,17 +107,58 @@ async def root():
     return {"status": "ok", "service": "LLM Council API"}
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and its event loop is responsive."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness(response: Response):
+    """
+    Readiness probe: 200 once model calls can be served, 503 while the
+    Copilot client is still warming up. The body reports warm-up progress.
+    """
+    status = get_startup_status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
+
 @app.get("/api/models")
 async def list_models():
-    """List all available models from Copilot."""
-    models = get_available_models()
-    return {"models": models}
+    """
+    List available models from the catalog snapshot, with their circuit
+    breaker health. Never waits on Copilot.
+    """
+    models = [
+        {**model, "health": get_model_health(model['id'])}
+        for model in get_available_models()
+    ]
+    return {"models": models, "generation": get_catalog_stats()["generation"]}
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for the Copilot client, storage and event loop."""
+    return {
+        "clients": get_pool_stats(),
+        "response_cache": get_cache_stats(),
+        "coalescing": get_coalescing_stats(),
+        "concurrency": get_concurrency_stats(),
+        "retries": get_retry_stats(),
+        "latency": get_latency_stats(),
+        "model_catalog": get_catalog_stats(),
+        "conversation_sessions": get_conversation_session_stats(),
+        "storage": storage.get_stats(),
+        "event_loop_lag": loop_lag.stats(),
+    }
 
 
 @app.get("/api/settings")
 async def get_settings():
     """Get current council settings."""
-    settings = storage.get_settings()
+    settings = await storage.get_settings()
     return settings
 
 
@@ -103,28 +169,43 @@ async def update_settings(request: SettingsRequest):
         "council_models": request.council_models,
         "chairman_model": request.chairman_model
     }
-    storage.save_settings(settings)
+    await storage.save_settings(settings)
     return settings
 
 
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
-    return storage.list_conversations()
+async def list_conversations(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None
+):
+    """
+    List conversations (metadata only), newest first.
+
+    Pass `limit` to page through the list; the cursor for the next page is
+    returned in the X-Next-Cursor header and omitted on the last page.
+    """
+    try:
+        conversations, next_cursor = await storage.list_conversations_page(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return conversations
 
 
 @app.post("/api/conversations", response_model=Conversation)
 async def create_conversation(request: CreateConversationRequest):
     """Create a new conversation."""
     conversation_id = str(uuid.uuid4())
-    conversation = storage.create_conversation(conversation_id)
+    conversation = await storage.create_conversation(conversation_id)
     return conversation
 
 
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
 async def get_conversation(conversation_id: str):
     """Get a specific conversation with all its messages."""
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return conversation
@@ -137,7 +218,7 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     Returns the complete response with all stages.
     """
     # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -145,32 +226,38 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     is_first_message = len(conversation["messages"]) == 0
 
     # Add user message
-    storage.add_user_message(conversation_id, request.content)
+    await storage.add_user_message(conversation_id, request.content)
 
     # Get current settings
-    settings = storage.get_settings()
+    settings = await storage.get_settings()
     council_models = settings.get("council_models", [])
     chairman_model = settings.get("chairman_model")
 
+    # Earlier turns for context, packed into the council's prompt budget
+    history = build_context(conversation, council_models, request.content)
+
     # If this is the first message, generate a title
     if is_first_message:
         title = await generate_conversation_title(request.content, chairman_model)
-        storage.update_conversation_title(conversation_id, title)
+        await storage.update_conversation_title(conversation_id, title)
 
     # Run the 3-stage council process
     stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
         request.content,
         council_models,
-        chairman_model
+        chairman_model,
+        conversation_id=conversation_id,
+        history=history
     )
 
     # Add assistant message with all stages
-    storage.add_assistant_message(
+    await storage.add_assistant_message(
         conversation_id,
         stage1_results,
         stage2_results,
         stage3_result
     )
+    schedule_summary_update(conversation_id, chairman_model)
 
     # Return the complete response with metadata
     return {
@@ -188,7 +275,7 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     Returns Server-Sent Events as each stage completes.
     """
     # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -196,49 +283,51 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     is_first_message = len(conversation["messages"]) == 0
 
     # Get current settings
-    settings = storage.get_settings()
+    settings = await storage.get_settings()
     council_models = settings.get("council_models", [])
     chairman_model = settings.get("chairman_model")
 
+    # Earlier turns for context, packed into the council's prompt budget
+    history = build_context(conversation, council_models, request.content)
+
     async def event_generator():
         try:
             # Add user message
-            storage.add_user_message(conversation_id, request.content)
+            await storage.add_user_message(conversation_id, request.content)
 
             # Start title generation in parallel (don't await yet)
             title_task = None
             if is_first_message:
                 title_task = asyncio.create_task(generate_conversation_title(request.content, chairman_model))
 
-            # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(request.content, council_models)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results, council_models)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results, chairman_model)
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            # Run the council as a pipeline, forwarding each stage event as it happens
+            stage1_results, stage2_results, stage3_result = [], [], {}
+            async for event in run_council_pipeline(
+                request.content, council_models, chairman_model, stream_deltas=True,
+                conversation_id=conversation_id, history=history
+            ):
+                if event['type'] == 'stage1_complete':
+                    stage1_results = event['data']
+                elif event['type'] == 'stage2_complete':
+                    stage2_results = event['data']
+                elif event['type'] == 'stage3_complete':
+                    stage3_result = event['data']
+                yield f"data: {json.dumps(event)}\n\n"
 
             # Wait for title generation if it was started
             if title_task:
                 title = await title_task
-                storage.update_conversation_title(conversation_id, title)
+                await storage.update_conversation_title(conversation_id, title)
                 yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
 
             # Save complete assistant message
-            storage.add_assistant_message(
+            await storage.add_assistant_message(
                 conversation_id,
                 stage1_results,
                 stage2_results,
                 stage3_result
             )
+            schedule_summary_update(conversation_id, chairman_model)
 
             # Send completion event
             yield f"data: {json.dumps({'type': 'complete'})}\n\n"
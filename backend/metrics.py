@@ -0,0 +1,57 @@
+"""Runtime health metrics for the backend process."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic sleep wakes up.
+
+    Anything blocking the loop (synchronous file I/O, heavy JSON encoding)
+    shows up directly as lag, delaying every concurrent request and stream.
+    """
+
+    def __init__(self, interval: float, window: int = 120):
+        self._interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current, p99 and maximum lag in milliseconds over the window."""
+        if not self._samples:
+            return {"samples": 0, "last_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "samples": len(self._samples),
+            "last_ms": round(self._samples[-1], 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(self._max_ms, 2),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self._interval
+            await asyncio.sleep(self._interval)
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
@@ -0,0 +1,129 @@
+"""Catalog of available models, refreshed in the background."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _to_dict(model: Any) -> Dict[str, Any]:
+    """Normalize an SDK ModelInfo (or an already plain dict) to a dict."""
+    if hasattr(model, "to_dict"):
+        return model.to_dict()
+    return dict(model)
+
+
+class ModelCatalog:
+    """
+    Snapshot of the models the Copilot subscription offers.
+
+    The snapshot is replaced wholesale on each refresh, so readers never
+    block and never see a half-updated catalog. `generation` goes up
+    whenever the contents change; anything derived from the catalog can
+    compare generations to know when to recompute. A failed refresh keeps
+    the previous snapshot.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[List[Any]]], ttl: float):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._models: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._generation = 0
+        self._refreshed_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped each time the catalog contents change."""
+        return self._generation
+
+    @property
+    def loaded(self) -> bool:
+        """Whether at least one refresh has succeeded."""
+        return self._refreshed_at is not None
+
+    @property
+    def models(self) -> List[Dict[str, Any]]:
+        """All models as dicts with 'id', 'name', 'capabilities', etc."""
+        return self._models
+
+    def get(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """Return the model's info dict, or None if it is not offered."""
+        return self._by_id.get(model_id)
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._by_id
+
+    def context_window(self, model_id: str) -> Optional[int]:
+        """Return the model's context window in tokens, if known."""
+        limits = self._limits(model_id)
+        return limits.get("max_context_window_tokens")
+
+    def max_prompt_tokens(self, model_id: str) -> Optional[int]:
+        """Return the model's prompt token limit, falling back to its context window."""
+        limits = self._limits(model_id)
+        return limits.get("max_prompt_tokens") or limits.get("max_context_window_tokens")
+
+    async def refresh(self) -> bool:
+        """
+        Fetch the model list and swap in a new snapshot.
+
+        Returns:
+            True if the refresh succeeded
+        """
+        async with self._lock:
+            try:
+                models = [_to_dict(m) for m in await self._fetch()]
+            except Exception as e:
+                self._last_error = str(e) or type(e).__name__
+                logger.error(f"Failed to refresh model catalog: {self._last_error}")
+                return False
+
+            by_id = {m['id']: m for m in models}
+            if by_id != self._by_id:
+                self._generation += 1
+                logger.info(f"Model catalog generation {self._generation}: {sorted(by_id)}")
+            self._models = models
+            self._by_id = by_id
+            self._refreshed_at = time.monotonic()
+            self._last_error = None
+            return True
+
+    def start(self) -> None:
+        """Start refreshing every `ttl` seconds in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def close(self) -> None:
+        """Stop the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the generation, size and age of the snapshot."""
+        return {
+            "generation": self._generation,
+            "models": len(self._models),
+            "age": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at else None,
+            "last_error": self._last_error,
+        }
+
+    def _limits(self, model_id: str) -> Dict[str, Any]:
+        model = self._by_id.get(model_id) or {}
+        return (model.get("capabilities") or {}).get("limits") or {}
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            # Retry sooner while the catalog has never loaded
+            await asyncio.sleep(self._ttl if self.loaded else min(self._ttl, 10.0))
+            await self.refresh()
@@ -0,0 +1,105 @@
+"""Token budgets for the Stage 2 and Stage 3 prompts."""
+
+import logging
+from typing import List, Optional, Tuple
+
+from .config import PROMPT_WINDOW_SHARE, PROMPT_SECTION_MIN_TOKENS
+from .copilot_client import catalog
+from .tokens import estimate_tokens, excerpt
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_budget(models: List[str], max_tokens: int) -> int:
+    """
+    Tokens a prompt sent to every model in `models` may use: `max_tokens`,
+    or PROMPT_WINDOW_SHARE of the smallest prompt limit in the model catalog
+    if that is lower. The rest of the window is left for the answer.
+    """
+    budget = max_tokens
+    for model in models:
+        limit = catalog.max_prompt_tokens(model)
+        if limit:
+            budget = min(budget, int(limit * PROMPT_WINDOW_SHARE))
+    return budget
+
+
+def allocate(
+    sizes: List[int],
+    budget: int,
+    weights: Optional[List[float]] = None,
+    minimum: int = 0
+) -> List[int]:
+    """
+    Split `budget` tokens between sections of the given sizes.
+
+    Sections that fit within their weighted share keep their full size, and
+    what they leave over is shared among the rest, so only the largest
+    sections are cut and the cuts are as even as the weights allow.
+
+    Args:
+        sizes: Estimated tokens of each section
+        budget: Tokens available for all sections together
+        weights: Relative claim of each section (default: equal)
+        minimum: Tokens every section keeps (or its whole size, if smaller),
+            even if that overruns `budget`
+
+    Returns:
+        Tokens allowed for each section, in the order of `sizes`
+    """
+    weights = weights or [1.0] * len(sizes)
+    allowed = [0] * len(sizes)
+    remaining = max(0, budget)
+    active = set(range(len(sizes)))
+    while active:
+        total_weight = sum(weights[i] for i in active)
+        share = {i: remaining * weights[i] / total_weight for i in active}
+        fitting = [i for i in active if sizes[i] <= share[i]]
+        if not fitting:
+            for i in active:
+                allowed[i] = int(share[i])
+            break
+        for i in fitting:
+            allowed[i] = sizes[i]
+            remaining -= sizes[i]
+            active.discard(i)
+    return [max(allowed[i], min(sizes[i], minimum)) for i in range(len(sizes))]
+
+
+def fit_sections(
+    texts: List[str],
+    budget: int,
+    weights: Optional[List[float]] = None
+) -> Tuple[List[str], List[Optional[Tuple[int, int]]]]:
+    """
+    Excerpt prompt sections so that together they fit in `budget` tokens.
+
+    Every section keeps at least PROMPT_SECTION_MIN_TOKENS, so a budget
+    eaten up by the rest of the prompt still leaves each one readable.
+
+    Args:
+        texts: Section texts, e.g. one per model response
+        budget: Tokens available for all sections together
+        weights: Relative claim of each section; higher keeps more
+
+    Returns:
+        Tuple of (fitted texts, per-section (original tokens, kept tokens)
+        for the sections that were cut, None for the rest)
+    """
+    sizes = [estimate_tokens(text) for text in texts]
+    if sum(sizes) <= budget:
+        return list(texts), [None] * len(texts)
+    if budget <= 0:
+        logger.warning(
+            f"Prompt is over budget before its {len(texts)} sections are added "
+            f"({-budget} tokens over); keeping at most {PROMPT_SECTION_MIN_TOKENS} tokens of each"
+        )
+
+    fitted = []
+    cuts: List[Optional[Tuple[int, int]]] = []
+    for text, size, allowed in zip(texts, sizes, allocate(sizes, budget, weights, PROMPT_SECTION_MIN_TOKENS)):
+        short = excerpt(text, allowed) if allowed < size else text
+        fitted.append(short)
+        # Sections too short to be worth cutting come back whole
+        cuts.append((size, allowed) if short != text else None)
+    return fitted, cuts
@@ -0,0 +1,206 @@
+"""Exact-match cache for model responses."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so trivially different prompts share an entry."""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of successful model responses keyed by (model, prompt).
+
+    The first tier is an in-memory LRU of `max_entries`. The second is one
+    small JSON file per entry under `disk_dir`, capped at `disk_max_bytes`
+    by evicting the oldest files. Entries older than `ttl` seconds are
+    ignored in both tiers. Disk reads and writes run in worker threads so
+    they never block the event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, disk_dir: Optional[str], disk_max_bytes: int):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._disk_dir = disk_dir
+        self._disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # key -> (size, created_at) for every file in the disk tier
+        self._disk: Optional[Dict[str, Tuple[int, float]]] = None
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._background: Set[asyncio.Task] = set()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        """Cache key for a model and prompt."""
+        raw = f"{model}\0{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached content for `key`, or None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            content, created_at = entry
+            if time.time() - created_at <= self._ttl:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return content
+            del self._memory[key]
+
+        if self._disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                content, created_at = entry
+                self._remember(key, content, created_at)
+                self._stats["disk_hits"] += 1
+                return content
+
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, content: str) -> None:
+        """Store content in memory now and on disk in the background."""
+        created_at = time.time()
+        self._remember(key, content, created_at)
+        self._stats["stores"] += 1
+
+        if self._disk_dir is not None:
+            task = asyncio.create_task(asyncio.to_thread(self._write_disk, key, content, created_at))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and tier sizes."""
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk) if self._disk is not None else None,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _remember(self, key: str, content: str, created_at: float) -> None:
+        self._memory[key] = (content, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # Disk tier - these run in worker threads
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, key[:2], f"{key}.json")
+
+    def _load_disk_index(self) -> None:
+        if self._disk is not None:
+            return
+        self._disk = {}
+        self._disk_bytes = 0
+        root = Path(self._disk_dir)
+        if not root.exists():
+            return
+        for path in root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            self._disk[path.stem] = (stat.st_size, stat.st_mtime)
+            self._disk_bytes += stat.st_size
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        try:
+            created_at = float(data["created_at"])
+            content = data["content"]
+            if not isinstance(content, str):
+                raise TypeError(f"content is {type(content).__name__}, not str")
+        except (KeyError, TypeError, ValueError) as e:
+            # Parsable but not an entry we wrote; it would fail every lookup
+            logger.debug(f"Discarding malformed cache entry {path}: {e!r}")
+            self._remove_disk(key)
+            return None
+
+        if time.time() - created_at > self._ttl:
+            return None
+        return content, created_at
+
+    def _remove_disk(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+        with self._disk_lock:
+            self._load_disk_index()
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous[0]
+
+    def _write_disk(self, key: str, content: str, created_at: float) -> None:
+        path = self._path(key)
+        payload = json.dumps({"content": content, "created_at": created_at}).encode()
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry: {e}")
+            return
+
+        with self._disk_lock:
+            self._load_disk_index()
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous[0]
+            self._disk[key] = (len(payload), created_at)
+            self._disk_bytes += len(payload)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        if self._disk_bytes <= self._disk_max_bytes:
+            return
+        for key, (size, _) in sorted(self._disk.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self._disk_max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self._disk[key]
+            self._disk_bytes -= size
+            self._stats["disk_evictions"] += 1
@@ -0,0 +1,131 @@
+"""Retry policy for model calls: error classification and jittered backoff."""
+
+import asyncio
+import logging
+import random
+import re
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Error kinds recorded as 'error_type' on failed responses
+ERROR_TIMEOUT = "timeout"
+ERROR_OVERLOADED = "overloaded"
+ERROR_RATE_LIMITED = "rate_limited"
+ERROR_TRANSIENT = "transient"
+ERROR_FATAL = "fatal"
+ERROR_CIRCUIT_OPEN = "circuit_open"
+
+RETRYABLE_ERRORS = {ERROR_TIMEOUT, ERROR_OVERLOADED, ERROR_RATE_LIMITED, ERROR_TRANSIENT}
+
+# Errors that will fail the same way however often they are retried
+_FATAL_PATTERN = re.compile(
+    r"not found|not available|not supported|unauthori[sz]ed|forbidden|\b40[0134]\b|"
+    r"invalid|context length|too long|too many tokens|content filter|not initialized",
+    re.IGNORECASE
+)
+_RATE_LIMIT_PATTERN = re.compile(r"rate.?limit|\b429\b|throttl|quota", re.IGNORECASE)
+
+
+def classify_error(response: Dict[str, Any]) -> Optional[str]:
+    """
+    Classify a failed query_model response.
+
+    Args:
+        response: Response dict from a model call
+
+    Returns:
+        One of the ERROR_* kinds, or None if the response succeeded
+    """
+    error = response.get('error')
+    if not error:
+        return None
+    if response.get('error_type') in RETRYABLE_ERRORS | {ERROR_FATAL, ERROR_CIRCUIT_OPEN}:
+        return response['error_type']
+    if _RATE_LIMIT_PATTERN.search(error):
+        return ERROR_RATE_LIMITED
+    if _FATAL_PATTERN.search(error):
+        return ERROR_FATAL
+    # Dropped connections, 5xx responses, empty replies and anything else
+    # unrecognised are worth another try
+    return ERROR_TRANSIENT
+
+
+def is_retryable(response: Dict[str, Any]) -> bool:
+    """Return True if the response failed with an error worth retrying."""
+    return classify_error(response) in RETRYABLE_ERRORS
+
+
+class RetryPolicy:
+    """
+    Retries failed model calls within a fixed deadline budget.
+
+    Attempt n waits a random delay between 0 and min(max_delay,
+    base_delay * 2**(n-1)) before it starts ("full jitter"), so calls that
+    failed together do not retry together. Each attempt gets whatever is
+    left of the budget as its own timeout, and no attempt is started with
+    less than `min_budget` seconds left.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float, min_budget: float):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_budget = min_budget
+        self._stats = {"retries": 0, "recovered": 0, "exhausted": 0}
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retrying after failed attempt number `attempt`."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def run(
+        self,
+        attempt: Callable[[float], Awaitable[Dict[str, Any]]],
+        budget: float,
+        can_retry: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Call `attempt(timeout)` until it succeeds, fails fatally, or runs out
+        of attempts or budget.
+
+        Args:
+            attempt: Makes one call with the given timeout and returns its response dict
+            budget: Total seconds available across all attempts and delays
+            can_retry: Optional check that vetoes further attempts (e.g. once
+                output has already been streamed to the caller)
+
+        Returns:
+            The last response, with 'attempts' set and 'error_type' set on failure
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        number = 1
+
+        while True:
+            response = await attempt(deadline - loop.time())
+            response['attempts'] = number
+            kind = classify_error(response)
+            if kind is None:
+                if number > 1:
+                    self._stats["recovered"] += 1
+                return response
+            response.setdefault('error_type', kind)
+
+            if kind not in RETRYABLE_ERRORS or (can_retry is not None and not can_retry()):
+                return response
+            delay = self.backoff(number)
+            if number >= self.max_attempts or deadline - loop.time() - delay < self.min_budget:
+                self._stats["exhausted"] += 1
+                return response
+
+            logger.info(
+                f"Retrying {response.get('model')} after {kind} error "
+                f"(attempt {number}/{self.max_attempts}) in {delay:.2f}s: {response['error']}"
+            )
+            self._stats["retries"] += 1
+            await asyncio.sleep(delay)
+            number += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry, recovery and exhaustion counters."""
+        return dict(self._stats)
@@ -0,0 +1,207 @@
+"""Per-model pool of warm Copilot sessions."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, bool]
+
+# Upper bound on how long teardown waits for an aborted request to stop
+ABORT_TIMEOUT = 5.0
+
+
+class _PooledSession:
+    """A warm session waiting in the pool."""
+
+    __slots__ = ("session", "created_at")
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.created_at = time.monotonic()
+
+
+class SessionPool:
+    """
+    Keeps a small number of pre-created sessions ready for each model.
+
+    Copilot sessions carry their own conversation history, so a session is
+    never handed to two unrelated queries. Instead the pool creates sessions
+    ahead of time and tears used ones down in the background, taking both
+    setup and teardown off the request path.
+    """
+
+    def __init__(self, client: Any, max_size: int, idle_timeout: float):
+        self._client = client
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._idle: Dict[PoolKey, Deque[_PooledSession]] = {}
+        self._refilling: Set[PoolKey] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._reaper: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "evicted": 0,
+            "unhealthy": 0,
+            "destroyed": 0,
+        }
+
+    def start(self) -> None:
+        """Start the background idle-eviction loop."""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def close(self) -> None:
+        """Stop background work and destroy every idle session."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        for entries in self._idle.values():
+            while entries:
+                await self._destroy(entries.popleft().session)
+        self._idle.clear()
+
+    async def acquire(self, model: str, streaming: bool = False) -> Any:
+        """
+        Check out a session for a single query.
+
+        Args:
+            model: Copilot model identifier
+            streaming: Whether the session should emit delta events
+
+        Returns:
+            A fresh session, taken from the pool when one is warm
+        """
+        key = (model, streaming)
+        entries = self._idle.get(key)
+
+        while entries:
+            entry = entries.popleft()
+            if not self._is_healthy(entry):
+                self._spawn(self._destroy(entry.session))
+                continue
+            self._stats["hits"] += 1
+            self._schedule_refill(key)
+            return entry.session
+
+        self._stats["misses"] += 1
+        session = await self._create(key)
+        self._schedule_refill(key)
+        return session
+
+    def release(self, session: Any, abort: bool = False) -> None:
+        """
+        Return a checked-out session once its query has finished.
+
+        The session is destroyed in the background so the caller does not
+        wait on teardown. Pass abort=True when the query was cancelled so the
+        in-flight request is stopped first.
+        """
+        if abort:
+            self._spawn(self._abort_and_destroy(session))
+        else:
+            self._spawn(self._destroy(session))
+
+    async def warm(self, models: List[str], streaming: bool = False) -> None:
+        """Fill the pool for the given models up to its maximum size."""
+        await asyncio.gather(
+            *(self._refill((model, streaming)) for model in models),
+            return_exceptions=True
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters and the current number of idle sessions."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "idle": {
+                f"{model}{' (streaming)' if streaming else ''}": len(entries)
+                for (model, streaming), entries in self._idle.items()
+            },
+        }
+
+    def _is_healthy(self, entry: _PooledSession) -> bool:
+        """Check that a pooled session is still fresh and its client connected."""
+        if time.monotonic() - entry.created_at > self._idle_timeout:
+            self._stats["evicted"] += 1
+            return False
+        get_state = getattr(self._client, "get_state", None)
+        if get_state is not None and get_state() != "connected":
+            self._stats["unhealthy"] += 1
+            return False
+        return True
+
+    async def _create(self, key: PoolKey) -> Any:
+        model, streaming = key
+        session = await self._client.create_session({
+            "model": model,
+            "streaming": streaming
+        })
+        self._stats["created"] += 1
+        return session
+
+    async def _destroy(self, session: Any) -> None:
+        try:
+            await session.destroy()
+            self._stats["destroyed"] += 1
+        except Exception as e:
+            logger.debug(f"Failed to destroy session: {e}")
+
+    async def _abort_and_destroy(self, session: Any) -> None:
+        try:
+            await asyncio.wait_for(session.abort(), timeout=ABORT_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Failed to abort session: {e}")
+        await self._destroy(session)
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        if self._closed or key in self._refilling:
+            return
+        self._spawn(self._refill(key))
+
+    async def _refill(self, key: PoolKey) -> None:
+        if key in self._refilling:
+            return
+        self._refilling.add(key)
+        try:
+            entries = self._idle.setdefault(key, deque())
+            while not self._closed and len(entries) < self._max_size:
+                session = await self._create(key)
+                entries.append(_PooledSession(session))
+        except Exception as e:
+            logger.warning(f"Failed to warm session for {key[0]}: {e}")
+        finally:
+            self._refilling.discard(key)
+
+    async def _reap_idle(self) -> None:
+        interval = max(self._idle_timeout / 2, 1.0)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            for entries in self._idle.values():
+                fresh = deque()
+                while entries:
+                    entry = entries.popleft()
+                    if self._is_healthy(entry):
+                        fresh.append(entry)
+                    else:
+                        self._spawn(self._destroy(entry.session))
+                entries.extend(fresh)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
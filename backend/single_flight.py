@@ -0,0 +1,112 @@
+"""Coalescing of identical concurrent requests into one upstream call."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+DeltaCallback = Callable[[str], None]
+
+
+class _Flight:
+    """One upstream call and everyone waiting on it."""
+
+    def __init__(self, streaming: bool):
+        self.streaming = streaming
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers: List[DeltaCallback] = []
+        self.deltas: List[str] = []
+        self.waiters = 0
+        self.abandoned = False
+
+    def publish(self, delta: str) -> None:
+        self.deltas.append(delta)
+        for callback in list(self.subscribers):
+            callback(delta)
+
+
+class SingleFlight:
+    """
+    Runs at most one upstream call per key at a time.
+
+    Callers arriving while a call for their key is in flight wait on the same
+    task instead of starting their own. If the first caller streams, every
+    streaming subscriber gets the deltas seen so far replayed in one piece
+    and then each new delta as it arrives. If the first caller does not
+    stream, streaming joiners get the whole answer as a single delta at the
+    end. The upstream call is only cancelled when every waiter has gone.
+    A joiner waits no longer than its own timeout, however long the call
+    it joined may take.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"leaders": 0, "joined": 0}
+
+    async def run(
+        self,
+        key: str,
+        start: Callable[[Optional[DeltaCallback]], Awaitable[Dict[str, Any]]],
+        streaming_callback: Optional[DeltaCallback] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run `start(publish)` for `key`, or join the call already in flight.
+
+        Args:
+            key: Identity of the request
+            start: Starts the upstream call; receives the delta publisher when streaming
+            streaming_callback: Optional callback(delta) for this caller
+            timeout: Seconds to wait when joining a call in flight (None = as
+                long as it takes). A call this caller starts enforces its own
+                deadline.
+
+        Returns:
+            A copy of the upstream response dict
+
+        Raises:
+            asyncio.TimeoutError: A joined call did not finish within `timeout`
+        """
+        flight = self._flights.get(key)
+        joined = not (flight is None or flight.abandoned)
+        if not joined:
+            flight = _Flight(streaming=streaming_callback is not None)
+            flight.task = asyncio.create_task(start(flight.publish if flight.streaming else None))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._stats["leaders"] += 1
+        else:
+            self._stats["joined"] += 1
+            if streaming_callback and flight.streaming and flight.deltas:
+                streaming_callback(''.join(flight.deltas))
+
+        subscribed = streaming_callback is not None and flight.streaming
+        if subscribed:
+            flight.subscribers.append(streaming_callback)
+        flight.waiters += 1
+
+        try:
+            if joined and timeout is not None:
+                response = await asyncio.wait_for(asyncio.shield(flight.task), timeout)
+            else:
+                response = await asyncio.shield(flight.task)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if flight.waiters == 1 and not flight.task.done():
+                flight.abandoned = True
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if subscribed:
+                flight.subscribers.remove(streaming_callback)
+
+        if streaming_callback and not flight.streaming and response.get('content'):
+            streaming_callback(response['content'])
+
+        return dict(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return leader/joiner counters and the number of calls in flight."""
+        return {**self._stats, "in_flight": len(self._flights)}
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,239 @@
+"""SQLite storage backend for conversations."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from .config import DATA_DIR
+from .storage import StorageBackend, new_conversation, decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    summary TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversations_created_at
+    ON conversations (created_at, id);
+
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_messages_created_at
+    ON messages (created_at);
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Conversations and messages in a SQLite database in WAL mode.
+
+    Appending a message inserts one row and bumps the conversation's
+    message_count in a single transaction, so a write costs O(message size)
+    rather than O(conversation size). Each thread gets its own connection.
+    """
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._migrate()
+        self._import_json_conversations()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        conversation = new_conversation(conversation_id)
+        self._connect().execute(
+            "INSERT INTO conversations (id, created_at, title) VALUES (?, ?, ?)",
+            (conversation["id"], conversation["created_at"], conversation["title"])
+        )
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id, created_at, title, summary FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        messages = [
+            json.loads(payload)
+            for (payload,) in conn.execute(
+                "SELECT payload FROM messages WHERE conversation_id = ? ORDER BY position",
+                (conversation_id,)
+            )
+        ]
+        return {
+            "id": row[0],
+            "created_at": row[1],
+            "title": row[2],
+            "summary": json.loads(row[3]) if row[3] else None,
+            "messages": messages
+        }
+
+    def save_conversation(self, conversation: Dict[str, Any]) -> None:
+        conn = self._connect()
+        now = datetime.utcnow().isoformat()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO conversations (id, created_at, title, message_count, summary) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET title = excluded.title, message_count = excluded.message_count, "
+                "summary = excluded.summary",
+                (
+                    conversation["id"],
+                    conversation["created_at"],
+                    conversation.get("title", "New Conversation"),
+                    len(conversation["messages"]),
+                    json.dumps(conversation["summary"]) if conversation.get("summary") else None
+                )
+            )
+            conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation["id"],))
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, position, role, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (conversation["id"], position, message.get("role", "user"), json.dumps(message), now)
+                    for position, message in enumerate(conversation["messages"])
+                ]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        query = "SELECT id, created_at, title, message_count FROM conversations"
+        params: List[Any] = []
+        if cursor is not None:
+            created_at, conversation_id = decode_cursor(cursor)
+            query += " WHERE (created_at, id) < (?, ?)"
+            params += [created_at, conversation_id]
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            # Fetch one extra row to know whether there is a next page
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        conversations = [
+            {"id": row[0], "created_at": row[1], "title": row[2], "message_count": row[3]}
+            for row in self._connect().execute(query, params)
+        ]
+        if limit is None or len(conversations) <= limit:
+            return conversations, None
+        conversations = conversations[:limit]
+        return conversations, encode_cursor(conversations[-1])
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT message_count FROM conversations WHERE id = ?",
+                (conversation_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            conn.execute(
+                "INSERT INTO messages (conversation_id, position, role, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, row[0], message.get("role", "user"), json.dumps(message), datetime.utcnow().isoformat())
+            )
+            conn.execute(
+                "UPDATE conversations SET message_count = message_count + 1 WHERE id = ?",
+                (conversation_id,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_title(self, conversation_id: str, title: str) -> None:
+        cursor = self._connect().execute(
+            "UPDATE conversations SET title = ? WHERE id = ?",
+            (title, conversation_id)
+        )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+    def update_summary(self, conversation_id: str, summary: Dict[str, Any]) -> None:
+        cursor = self._connect().execute(
+            "UPDATE conversations SET summary = ? WHERE id = ?",
+            (json.dumps(summary), conversation_id)
+        )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+    def _migrate(self) -> None:
+        """Add columns introduced after the database was created."""
+        conn = self._connect()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(conversations)")}
+        if "summary" not in columns:
+            conn.execute("ALTER TABLE conversations ADD COLUMN summary TEXT")
+
+    def _import_json_conversations(self) -> None:
+        """Copy existing JSON conversations into an empty database."""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM conversations LIMIT 1").fetchone() is not None:
+            return
+        if not os.path.isdir(DATA_DIR):
+            return
+
+        imported = 0
+        for filename in os.listdir(DATA_DIR):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(DATA_DIR, filename), 'r') as f:
+                    self.save_conversation(json.load(f))
+                imported += 1
+            except (json.JSONDecodeError, KeyError, OSError) as e:
+                logger.warning(f"Skipping {filename} during import: {e}")
+
+        if imported:
+            logger.info(f"Imported {imported} JSON conversations into {self._db_path}")
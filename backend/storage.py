@@ -1,11 +1,37 @@
-"""JSON-based storage for conversations."""
+"""Storage for conversations and settings.
 
+Conversations go through a pluggable StorageBackend selected by
+STORAGE_BACKEND in config: one JSON file per conversation ("json") or a
+SQLite database in WAL mode ("sqlite"). The module-level functions below are
+the public API and keep the same signatures whichever backend is active.
+"""
+
+import base64
 import json
+import logging
 import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from pathlib import Path
-from .config import DATA_DIR, SETTINGS_FILE, DEFAULT_COUNCIL_MODELS, DEFAULT_CHAIRMAN_MODEL
+from .config import (
+    DATA_DIR,
+    CONVERSATION_INDEX_FILE,
+    SETTINGS_FILE,
+    DEFAULT_COUNCIL_MODELS,
+    DEFAULT_CHAIRMAN_MODEL,
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
 
 
 def ensure_data_dir():
@@ -23,6 +49,391 @@ def get_conversation_path(conversation_id: str) -> str:
     return os.path.join(DATA_DIR, f"{conversation_id}.json")
 
 
+def get_conversation_lock_path(conversation_id: str) -> str:
+    """Get the lock file path guarding writes to a conversation."""
+    return os.path.join(DATA_DIR, f"{conversation_id}.lock")
+
+
+def new_conversation(conversation_id: str) -> Dict[str, Any]:
+    """Build an empty conversation dict."""
+    return {
+        "id": conversation_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "title": "New Conversation",
+        "messages": []
+    }
+
+
+def conversation_metadata(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the list-view metadata from a full conversation."""
+    return {
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(conversation["messages"])
+    }
+
+
+def encode_cursor(entry: Dict[str, Any]) -> str:
+    """Encode a pagination cursor pointing just past `entry`."""
+    raw = json.dumps([entry["created_at"], entry["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, conversation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(conversation_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(
+    entries: List[Dict[str, Any]],
+    limit: Optional[int],
+    cursor: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Page through metadata sorted newest first by (created_at, id).
+
+    Returns:
+        Tuple of (page, cursor for the next page or None on the last page)
+    """
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        entries = [e for e in entries if (e["created_at"], e["id"]) < after]
+    if limit is None or len(entries) <= limit:
+        return entries, None
+    page = entries[:limit]
+    return page, encode_cursor(page[-1])
+
+
+def assistant_message(
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build the stored form of an assistant message."""
+    return {
+        "role": "assistant",
+        "stage1": stage1,
+        "stage2": stage2,
+        "stage3": stage3
+    }
+
+
+# ============================================================================
+# Storage Backends
+# ============================================================================
+
+class StorageBackend(ABC):
+    """Interface every conversation storage backend implements."""
+
+    @abstractmethod
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """Create and persist an empty conversation."""
+
+    @abstractmethod
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Load a full conversation, or None if it does not exist."""
+
+    @abstractmethod
+    def save_conversation(self, conversation: Dict[str, Any]) -> None:
+        """Persist a full conversation, replacing any stored version."""
+
+    @abstractmethod
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List conversation metadata newest first, with the next page's cursor."""
+
+    @abstractmethod
+    def append_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        """Append one message. Raises ValueError if the conversation is missing."""
+
+    @abstractmethod
+    def update_title(self, conversation_id: str, title: str) -> None:
+        """Set the title. Raises ValueError if the conversation is missing."""
+
+    @abstractmethod
+    def update_summary(self, conversation_id: str, summary: Dict[str, Any]) -> None:
+        """Set the rolling summary. Raises ValueError if the conversation is missing."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on `path` for the duration of the block.
+
+    This is what lets several server processes share DATA_DIR. Where fcntl is
+    unavailable (Windows) it is a no-op, so only a single worker is safe there.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: str, data: Any, **dump_kwargs) -> None:
+    """Write JSON to a temp file and rename it over `path`, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ConversationIndex:
+    """
+    Metadata for every JSON conversation, so listing does not open each file.
+
+    Every change is appended as one line to CONVERSATION_INDEX_FILE and the
+    entries are kept in memory. Before each read or write the journal is
+    caught up from where this process last stopped, so changes made by other
+    server processes show up too. The file is compacted once it holds far
+    more lines than entries, and a missing or corrupt index is rebuilt from
+    the conversation files. All file access happens under a file lock.
+    """
+
+    # Extra journal lines tolerated before compacting
+    COMPACT_SLACK = 100
+
+    def __init__(self, path: str, data_dir: str):
+        self._path = path
+        self._lock_path = f"{path}.lock"
+        self._data_dir = data_dir
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._journal_lines = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(self._lock_path):
+            self._refresh()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All metadata entries sorted newest first."""
+        with self._lock, file_lock(self._lock_path):
+            self._refresh()
+            entries = list(self._entries.values())
+        entries.sort(key=lambda e: (e["created_at"], e["id"]), reverse=True)
+        return entries
+
+    def update(self, metadata: Dict[str, Any]) -> None:
+        """Record new or changed metadata for one conversation."""
+        with self._lock, file_lock(self._lock_path):
+            self._refresh()
+            self._entries[metadata["id"]] = metadata
+            with open(self._path, 'ab') as f:
+                f.write((json.dumps(metadata) + "\n").encode())
+                self._offset = f.tell()
+            self._journal_lines += 1
+            if self._journal_lines > 2 * len(self._entries) + self.COMPACT_SLACK:
+                self._compact()
+
+    def rebuild(self) -> None:
+        """Rebuild the index by scanning every conversation file."""
+        with self._lock, file_lock(self._lock_path):
+            self._rebuild()
+
+    def _refresh(self) -> None:
+        """Replay journal lines written since the last refresh. Caller holds both locks."""
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            self._rebuild()
+            return
+
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # Compacted or replaced by another process: start over
+            self._entries = {}
+            self._journal_lines = 0
+            self._offset = 0
+            self._inode = stat.st_ino
+
+        if stat.st_size == self._offset:
+            return
+
+        try:
+            with open(self._path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+            for line in chunk.decode().splitlines():
+                if not line.strip():
+                    continue
+                metadata = json.loads(line)
+                self._entries[metadata["id"]] = metadata
+                self._journal_lines += 1
+            self._offset += len(chunk)
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, OSError) as e:
+            logger.warning(f"Conversation index is unreadable ({e}), rebuilding")
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        entries = {}
+        if os.path.isdir(self._data_dir):
+            for filename in os.listdir(self._data_dir):
+                if not filename.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(self._data_dir, filename), 'r') as f:
+                        metadata = conversation_metadata(json.load(f))
+                    entries[metadata["id"]] = metadata
+                except (json.JSONDecodeError, KeyError, OSError) as e:
+                    logger.warning(f"Skipping {filename} while rebuilding index: {e}")
+
+        self._entries = entries
+        self._compact()
+        logger.info(f"Rebuilt conversation index with {len(entries)} entries")
+
+    def _compact(self) -> None:
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for metadata in self._entries.values():
+                f.write((json.dumps(metadata) + "\n").encode())
+            offset = f.tell()
+        os.replace(tmp_path, self._path)
+        self._inode = os.stat(self._path).st_ino
+        self._offset = offset
+        self._journal_lines = len(self._entries)
+
+
+class JSONStorage(StorageBackend):
+    """
+    One pretty-printed JSON file per conversation under DATA_DIR.
+
+    Read-modify-write cycles run under a per-conversation file lock and
+    files are replaced atomically, so several server processes can share
+    DATA_DIR without losing updates.
+    """
+
+    def __init__(self):
+        ensure_data_dir()
+        self.index = ConversationIndex(CONVERSATION_INDEX_FILE, DATA_DIR)
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        conversation = new_conversation(conversation_id)
+        self.save_conversation(conversation)
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        path = get_conversation_path(conversation_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def save_conversation(self, conversation: Dict[str, Any]) -> None:
+        ensure_data_dir()
+
+        with file_lock(get_conversation_lock_path(conversation['id'])):
+            self._write(conversation)
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return paginate(self.index.entries(), limit, cursor)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]) -> None:
+        with file_lock(get_conversation_lock_path(conversation_id)):
+            conversation = self.get_conversation(conversation_id)
+            if conversation is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            conversation["messages"].append(message)
+            self._write(conversation)
+
+    def update_title(self, conversation_id: str, title: str) -> None:
+        with file_lock(get_conversation_lock_path(conversation_id)):
+            conversation = self.get_conversation(conversation_id)
+            if conversation is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            conversation["title"] = title
+            self._write(conversation)
+
+    def update_summary(self, conversation_id: str, summary: Dict[str, Any]) -> None:
+        with file_lock(get_conversation_lock_path(conversation_id)):
+            conversation = self.get_conversation(conversation_id)
+            if conversation is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            conversation["summary"] = summary
+            self._write(conversation)
+
+    def _write(self, conversation: Dict[str, Any]) -> None:
+        """Write a conversation and its index entry. Caller holds the conversation's file lock."""
+        write_json_atomic(get_conversation_path(conversation['id']), conversation, indent=2)
+        self.index.update(conversation_metadata(conversation))
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """
+    Get the active storage backend, creating it on first use.
+
+    Returns:
+        The backend configured by STORAGE_BACKEND
+    """
+    global _backend
+
+    # Storage calls run on a thread pool, so guard the lazy creation
+    with _backend_lock:
+        if _backend is None:
+            if STORAGE_BACKEND == "sqlite":
+                from .sqlite_storage import SQLiteStorage
+                _backend = SQLiteStorage(SQLITE_PATH)
+            elif STORAGE_BACKEND == "json":
+                _backend = JSONStorage()
+            else:
+                raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+
+        return _backend
+
+
+def close_backend() -> None:
+    """Close the active storage backend. Called at app shutdown."""
+    global _backend
+
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
+
+
+# ============================================================================
+# Conversations
+# ============================================================================
+
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
     """
     Create a new conversation.
@@ -33,21 +444,7 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     Returns:
         New conversation dict
     """
-    ensure_data_dir()
-
-    conversation = {
-        "id": conversation_id,
-        "created_at": datetime.utcnow().isoformat(),
-        "title": "New Conversation",
-        "messages": []
-    }
-
-    # Save to file
-    path = get_conversation_path(conversation_id)
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
-
-    return conversation
+    return get_backend().create_conversation(conversation_id)
 
 
 def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
@@ -60,13 +457,7 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Conversation dict or None if not found
     """
-    path = get_conversation_path(conversation_id)
-
-    if not os.path.exists(path):
-        return None
-
-    with open(path, 'r') as f:
-        return json.load(f)
+    return get_backend().get_conversation(conversation_id)
 
 
 def save_conversation(conversation: Dict[str, Any]):
@@ -76,11 +467,7 @@ def save_conversation(conversation: Dict[str, Any]):
     Args:
         conversation: Conversation dict to save
     """
-    ensure_data_dir()
-
-    path = get_conversation_path(conversation['id'])
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    get_backend().save_conversation(conversation)
 
 
 def list_conversations() -> List[Dict[str, Any]]:
@@ -88,30 +475,39 @@ def list_conversations() -> List[Dict[str, Any]]:
     List all conversations (metadata only).
 
     Returns:
-        List of conversation metadata dicts
-    """
-    ensure_data_dir()
-
-    conversations = []
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            path = os.path.join(DATA_DIR, filename)
-            with open(path, 'r') as f:
-                data = json.load(f)
-                # Return metadata only
-                conversations.append({
-                    "id": data["id"],
-                    "created_at": data["created_at"],
-                    "title": data.get("title", "New Conversation"),
-                    "message_count": len(data["messages"])
-                })
-
-    # Sort by creation time, newest first
-    conversations.sort(key=lambda x: x["created_at"], reverse=True)
-
+        List of conversation metadata dicts, newest first
+    """
+    conversations, _ = get_backend().list_conversations()
     return conversations
 
 
+def list_conversations_page(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    List one page of conversation metadata, newest first.
+
+    Args:
+        limit: Maximum number of conversations to return (None = all)
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Tuple of (metadata dicts, cursor for the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return get_backend().list_conversations(limit, cursor)
+
+
+def rebuild_conversation_index() -> None:
+    """Rebuild the JSON backend's metadata index from the conversation files."""
+    backend = get_backend()
+    if isinstance(backend, JSONStorage):
+        backend.index.rebuild()
+
+
 def add_user_message(conversation_id: str, content: str):
     """
     Add a user message to a conversation.
@@ -120,17 +516,11 @@ def add_user_message(conversation_id: str, content: str):
         conversation_id: Conversation identifier
         content: User message content
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
+    get_backend().append_message(conversation_id, {
         "role": "user",
         "content": content
     })
 
-    save_conversation(conversation)
-
 
 def add_assistant_message(
     conversation_id: str,
@@ -147,18 +537,7 @@ def add_assistant_message(
         stage2: List of model rankings
         stage3: Final synthesized response
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
-        "role": "assistant",
-        "stage1": stage1,
-        "stage2": stage2,
-        "stage3": stage3
-    })
-
-    save_conversation(conversation)
+    get_backend().append_message(conversation_id, assistant_message(stage1, stage2, stage3))
 
 
 def update_conversation_title(conversation_id: str, title: str):
@@ -169,12 +548,19 @@ def update_conversation_title(conversation_id: str, title: str):
         conversation_id: Conversation identifier
         title: New title for the conversation
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
+    get_backend().update_title(conversation_id, title)
+
+
+def update_conversation_summary(conversation_id: str, summary: Dict[str, Any]):
+    """
+    Store the rolling summary of a conversation's older turns.
 
-    conversation["title"] = title
-    save_conversation(conversation)
+    Args:
+        conversation_id: Conversation identifier
+        summary: Dict with the summary 'text' and the number of history
+            'messages' it covers (see backend.context)
+    """
+    get_backend().update_summary(conversation_id, summary)
 
 
 # ============================================================================
@@ -222,5 +608,4 @@ def save_settings(settings: Dict[str, Any]) -> None:
     """
     ensure_settings_dir()
 
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+    write_json_atomic(SETTINGS_FILE, settings, indent=2)
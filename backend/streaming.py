@@ -0,0 +1,199 @@
+"""Bridging model token deltas into the SSE event stream."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# Event types yielded by stream_events()
+EVENT_DELTA = "delta"
+EVENT_USAGE = "usage"
+EVENT_DONE = "done"
+EVENT_ERROR = "error"
+
+
+class DeltaCoalescer:
+    """
+    Collects per-model token deltas and releases them as SSE frames.
+
+    Deltas arrive through plain callbacks from the SDK event handlers, which
+    run on the event loop. They are buffered per model and pushed onto an
+    asyncio queue as a single frame once the buffer reaches `max_chars`, or
+    `interval` seconds after its first unflushed delta, so a fast model does
+    not turn into one SSE frame per token.
+    """
+
+    def __init__(self, event_type: str, interval: float, max_chars: int):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._event_type = event_type
+        self._interval = interval
+        self._max_chars = max_chars
+        self._buffers: Dict[str, List[str]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def callback(self, model: str) -> Callable[[str], None]:
+        """Return a streaming_callback that feeds deltas for `model`."""
+        return lambda delta: self.add(model, delta)
+
+    def add(self, model: str, delta: str) -> None:
+        """Buffer a delta, flushing once the size budget is reached."""
+        if not delta:
+            return
+        self._buffers.setdefault(model, []).append(delta)
+        self._sizes[model] = self._sizes.get(model, 0) + len(delta)
+
+        if self._sizes[model] >= self._max_chars:
+            self.flush(model)
+        elif model not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[model] = loop.call_later(self._interval, self.flush, model)
+
+    def flush(self, model: str) -> None:
+        """Push whatever is buffered for `model` onto the queue."""
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        parts = self._buffers.pop(model, None)
+        self._sizes.pop(model, None)
+        if parts:
+            self.queue.put_nowait({
+                'type': self._event_type,
+                'model': model,
+                'delta': ''.join(parts)
+            })
+
+    def flush_all(self) -> None:
+        """Flush every model's buffer."""
+        for model in list(self._buffers):
+            self.flush(model)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every frame currently on the queue without waiting."""
+        frames = []
+        while not self.queue.empty():
+            frames.append(self.queue.get_nowait())
+        return frames
+
+    def close(self) -> None:
+        """Cancel pending flush timers."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+
+async def wait_with_frames(
+    pending: Set[asyncio.Task],
+    coalescer: Optional[DeltaCoalescer],
+    timeout: Optional[float] = None
+) -> Tuple[Set[asyncio.Task], Set[asyncio.Task], List[Dict[str, Any]]]:
+    """
+    Like asyncio.wait(..., return_when=FIRST_COMPLETED), but also wakes up
+    when the coalescer has frames ready.
+
+    Returns:
+        Tuple of (done tasks, still pending tasks, frames to send)
+    """
+    if coalescer is None:
+        done, pending = await asyncio.wait(
+            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        return done, pending, []
+
+    getter = asyncio.create_task(coalescer.queue.get())
+    try:
+        done, _ = await asyncio.wait(
+            pending | {getter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        getter.cancel()
+
+    frames = []
+    if getter in done:
+        done.discard(getter)
+        frames.append(getter.result())
+    frames.extend(coalescer.drain())
+
+    return done, pending - done, frames
+
+
+async def stream_events(
+    model: str,
+    start: Callable[[Callable[[str], None]], Awaitable[Dict[str, Any]]],
+    max_buffered: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Turn a callback-driven model call into an async iterator of events.
+
+    `start(callback)` must run the call, feeding deltas to `callback`, and
+    return the final response dict. Events are dicts with a 'type' of
+    EVENT_DELTA ('delta'), EVENT_USAGE ('usage'), then exactly one of
+    EVENT_DONE (the full 'response') or EVENT_ERROR ('error', 'error_type').
+
+    Deltas wait in a queue of at most `max_buffered` events. The SDK cannot
+    be paused, so once the queue is full further deltas are merged into a
+    single pending delta that is queued as soon as the consumer catches up;
+    a slow consumer costs one string, not one queued event per token.
+
+    Leaving the iteration early (break, aclose() or cancellation) cancels
+    the call, which aborts the request on its session.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    overflow: List[str] = []
+
+    def on_delta(delta: str) -> None:
+        if not delta:
+            return
+        if overflow or queue.full():
+            overflow.append(delta)
+        else:
+            queue.put_nowait({'type': EVENT_DELTA, 'model': model, 'delta': delta})
+
+    def promote_overflow() -> None:
+        # Room has been made in the queue: move the merged backlog into it
+        if overflow and not queue.full():
+            queue.put_nowait({'type': EVENT_DELTA, 'model': model, 'delta': ''.join(overflow)})
+            overflow.clear()
+
+    task = asyncio.create_task(start(on_delta))
+    try:
+        while not task.done():
+            if queue.empty():
+                getter = asyncio.create_task(queue.get())
+                try:
+                    await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    getter.cancel()
+                if not getter.done() or getter.cancelled():
+                    continue
+                event = getter.result()
+            else:
+                event = queue.get_nowait()
+            promote_overflow()
+            yield event
+
+        while not queue.empty():
+            event = queue.get_nowait()
+            promote_overflow()
+            yield event
+        if overflow:
+            yield {'type': EVENT_DELTA, 'model': model, 'delta': ''.join(overflow)}
+            overflow.clear()
+
+        response = task.result()
+        if response.get('usage'):
+            yield {'type': EVENT_USAGE, 'model': model, 'usage': response['usage']}
+        if response.get('error'):
+            yield {
+                'type': EVENT_ERROR,
+                'model': model,
+                'error': response['error'],
+                'error_type': response.get('error_type')
+            }
+        else:
+            yield {'type': EVENT_DONE, 'model': model, 'response': response}
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
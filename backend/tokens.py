@@ -0,0 +1,70 @@
+"""Fast, offline estimates of prompt size in tokens."""
+
+from typing import Dict, List
+
+# Average characters per token across the models Copilot serves. Close
+# enough for budgeting, and needs neither a tokenizer nor the network.
+CHARS_PER_TOKEN = 4
+
+# Tokens of role/turn framing each message adds on top of its content
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in `text`."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt tokens a list of message dicts will take."""
+    return sum(estimate_tokens(msg.get('content', '')) + MESSAGE_OVERHEAD_TOKENS for msg in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " […]") -> str:
+    """
+    Cut `text` down to about `max_tokens`, preferring a word boundary.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget, including the marker
+        marker: Appended when anything was cut
+
+    Returns:
+        `text` unchanged if it fits, otherwise its head followed by `marker`
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - len(marker))
+    head = text[:limit]
+    # Back up to the last whitespace unless that would throw away too much
+    cut = head.rfind(' ')
+    if cut > limit * 0.8:
+        head = head[:cut]
+    return head.rstrip() + marker
+
+
+def excerpt(text: str, max_tokens: int) -> str:
+    """
+    Cut `text` down to about `max_tokens` by dropping its middle.
+
+    Both ends are kept because answers and critiques tend to open with
+    their main point and close with their conclusion or ranking.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget, including the omission marker
+
+    Returns:
+        `text` unchanged if it fits, or if the marker would take up as much
+        room as the text it replaces; otherwise head, marker and tail
+    """
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+    marker = f"\n\n[… about {total - max_tokens} tokens omitted …]\n\n"
+    chars = max(0, max_tokens * CHARS_PER_TOKEN - len(marker))
+    if len(text) <= chars + len(marker):
+        return text
+    head = chars * 2 // 3
+    tail = chars - head
+    return text[:head].rstrip() + marker + (text[-tail:].lstrip() if tail else "")
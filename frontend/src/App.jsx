@@ -103,11 +103,31 @@ function App() {
             });
             break;
 
+          case 'stage1_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const stage1 = [...(lastMsg.stage1 || [])];
+              const index = stage1.findIndex((r) => r.model === event.model);
+              if (index === -1) {
+                stage1.push({ model: event.model, response: event.delta, streaming: true });
+              } else if (stage1[index].streaming) {
+                stage1[index] = { ...stage1[index], response: stage1[index].response + event.delta };
+              }
+              lastMsg.stage1 = stage1;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
               const lastMsg = messages[messages.length - 1];
-              lastMsg.stage1 = event.data;
+              // Keep models that are still streaming after the quorum was reached
+              const stillStreaming = (lastMsg.stage1 || []).filter(
+                (r) => r.streaming && !event.data.some((d) => d.model === r.model)
+              );
+              lastMsg.stage1 = [...event.data, ...stillStreaming];
               lastMsg.loading.stage1 = false;
               return { ...prev, messages };
             });
@@ -142,6 +162,16 @@ function App() {
             });
             break;
 
+          case 'stage3_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const partial = lastMsg.stage3?.response || '';
+              lastMsg.stage3 = { model: event.model, response: partial + event.delta, streaming: true };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage3_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -106,6 +106,14 @@ export default function Settings({ isOpen, onClose, onSave }) {
                           onChange={() => handleCouncilModelToggle(model.id)}
                         />
                         <span className="model-name">{model.name || model.id}</span>
+                        {model.health && model.health.state !== 'closed' && (
+                          <span
+                            className={`model-health ${model.health.state}`}
+                            title={model.health.last_error || ''}
+                          >
+                            {model.health.state === 'open' ? 'unavailable' : 'recovering'}
+                          </span>
+                        )}
                         <span className="model-id">{model.id}</span>
                       </label>
                     ))
@@ -0,0 +1,79 @@
+"""Tests for backend.client_pool."""
+
+import asyncio
+import unittest
+
+from backend.client_pool import ClientPool
+
+
+class FakeClient:
+    """Stands in for a Copilot client; counts CLI processes left running."""
+
+    running = 0
+
+    def __init__(self, start_error=None, hang=False):
+        self.start_error = start_error
+        self.hang = hang
+        self.process = False
+
+    async def start(self):
+        FakeClient.running += 1
+        self.process = True
+        if self.hang:
+            await asyncio.sleep(3600)
+        if self.start_error:
+            raise self.start_error
+
+    async def stop(self):
+        if self.process:
+            FakeClient.running -= 1
+            self.process = False
+        return []
+
+
+def make_pool(factory, size=1):
+    return ClientPool(
+        factory,
+        size,
+        session_pool_size=1,
+        session_idle_timeout=60.0,
+        health_interval=60.0,
+        ping_timeout=1.0,
+        ping_failures=2,
+        max_restart_backoff=1.0
+    )
+
+
+class StartFailureTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        FakeClient.running = 0
+
+    async def test_failed_start_stops_the_client(self):
+        pool = make_pool(lambda: FakeClient(start_error=RuntimeError("boom")), size=2)
+        with self.assertRaises(RuntimeError):
+            await pool.start()
+        await pool.close()
+        self.assertEqual(FakeClient.running, 0)
+
+    async def test_cancelled_start_stops_the_client(self):
+        pool = make_pool(lambda: FakeClient(hang=True))
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.start(), timeout=0.05)
+        await pool.close()
+        self.assertEqual(FakeClient.running, 0)
+
+    async def test_failed_restart_stops_the_client(self):
+        clients = [FakeClient(), FakeClient(start_error=RuntimeError("boom"))]
+        pool = make_pool(lambda: clients.pop(0))
+        await pool.start()
+        shard = await pool.acquire()
+        pool.release(shard)
+
+        await pool.restart(shard, "test")
+        self.assertIsNone(shard.client)
+        self.assertEqual(FakeClient.running, 0)
+        await pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for backend.response_cache."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from backend.response_cache import ResponseCache
+
+
+class MalformedDiskEntryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(10, 3600.0, self.tmp.name, 1024 * 1024)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_entry(self, key, payload):
+        path = self.cache._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+        return path
+
+    async def test_malformed_entries_are_misses_and_removed(self):
+        payloads = [
+            {"content": "missing created_at"},
+            {"created_at": 1e12},
+            {"created_at": "not a time", "content": "x"},
+            {"created_at": 1e12, "content": None},
+            ["not", "a", "dict"],
+        ]
+        for i, payload in enumerate(payloads):
+            key = ResponseCache.key("model", f"prompt {i}")
+            path = self.write_entry(key, payload)
+            with self.subTest(payload=payload):
+                self.assertIsNone(await self.cache.get(key))
+                self.assertFalse(os.path.exists(path))
+
+    async def test_valid_entry_is_served(self):
+        key = ResponseCache.key("model", "prompt")
+        self.write_entry(key, {"created_at": 1e12, "content": "cached answer"})
+        self.assertEqual(await self.cache.get(key), "cached answer")
+
+
+if __name__ == "__main__":
+    unittest.main()
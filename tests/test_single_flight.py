@@ -0,0 +1,49 @@
+"""Tests for backend.single_flight."""
+
+import asyncio
+import unittest
+
+from backend.single_flight import SingleFlight
+
+
+class JoinerTimeoutTests(unittest.IsolatedAsyncioTestCase):
+    async def test_joiner_gives_up_at_its_own_timeout(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def start(publish):
+            calls.append(1)
+            await asyncio.sleep(0.3)
+            return {"content": "answer"}
+
+        leader = asyncio.create_task(flight.run("key", start, timeout=10.0))
+        await asyncio.sleep(0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            await flight.run("key", start, timeout=0.05)
+        self.assertLess(loop.time() - started, 0.2)
+
+        # The leader's call carries on and is made only once
+        self.assertEqual((await leader)["content"], "answer")
+        self.assertEqual(calls, [1])
+
+    async def test_joiner_within_timeout_shares_the_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def start(publish):
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"content": "answer"}
+
+        results = await asyncio.gather(
+            flight.run("key", start, timeout=1.0),
+            flight.run("key", start, timeout=1.0),
+        )
+        self.assertEqual([r["content"] for r in results], ["answer", "answer"])
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()